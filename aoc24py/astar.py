@@ -6,6 +6,7 @@
 # Website:  leechristie.com
 
 import math
+from array import array
 from collections import defaultdict
 from typing import Callable, Optional
 
@@ -125,6 +126,299 @@ class BinaryMinHeap[E]:
             self.__repair_heap(smallest_index)
 
 
+# a d-ary min heap of int node ids, the nodes and their keys are held in two parallel lists in heap order, and the
+# position of each node in the heap in a third list indexed by node id, so there is no object per element and no dict
+# lookup, and sifting compares keys without going through the node, positions grow to fit the largest node id seen,
+# a wider heap is shallower, so sifting up after decrease_key takes fewer steps
+class IndexedHeap:
+
+    __slots__ = ['arity', 'heap', 'keys', 'positions']
+
+    def __init__(self, capacity: int=0, arity: int=4) -> None:
+        assert arity >= 2
+        heap: list[int] = []
+        keys: list[float] = []
+        positions: list[int] = [-1] * capacity
+        self.arity = arity
+        self.heap = heap
+        self.keys = keys
+        self.positions = positions
+
+    # a heap of all the nodes at once, built bottom up in linear time rather than by inserting them one at a time
+    @staticmethod
+    def heapify(items: list[tuple[int, float]], arity: int=4) -> 'IndexedHeap':
+        rv = IndexedHeap(0, arity)
+        for node, key in items:
+            if node >= len(rv.positions):
+                rv.__reserve(node)
+            if rv.positions[node] >= 0:
+                raise ValueError(f'duplicate element {node}')
+            rv.positions[node] = len(rv.heap)
+            rv.heap.append(node)
+            rv.keys.append(key)
+        for index in range((len(rv.heap) - 2) // arity, -1, -1):
+            rv.__sift_down(index, rv.heap[index], rv.keys[index])
+        return rv
+
+    def __len__(self) -> int:
+        return len(self.heap)
+
+    def __contains__(self, node: int) -> bool:
+        return node < len(self.positions) and self.positions[node] >= 0
+
+    def empty(self) -> bool:
+        return not self.heap
+
+    def key(self, node: int) -> float:
+        if node not in self:
+            raise ValueError(f'no element {node} in heap')
+        return self.keys[self.positions[node]]
+
+    def insert(self, node: int, key: float) -> None:
+        if node >= len(self.positions):
+            self.__reserve(node)
+        if self.positions[node] >= 0:
+            raise ValueError(f'duplicate element {node}')
+        self.heap.append(node)
+        self.keys.append(key)
+        self.__sift_up(len(self.heap) - 1, node, key)
+
+    def find_min(self) -> int:
+        if not self.heap:
+            raise ValueError('no elements in heap to find min')
+        return self.heap[0]
+
+    def delete_min(self) -> None:
+        if not self.heap:
+            raise ValueError('no elements in heap to delete min')
+        self.pop_min()
+
+    def decrease_key(self, node: int, key: float) -> None:
+        index = self.positions[node] if node < len(self.positions) else -1
+        if index < 0:
+            self.insert(node, key)
+            return
+        if key >= self.keys[index]:
+            raise ValueError(f'could not decrease key to a non-lower value for {node}')
+        self.__sift_up(index, node, key)
+
+    def pop_min(self) -> int:
+        if not self.heap:
+            raise ValueError('no elements in heap to pop min')
+        root = self.heap[0]
+        self.positions[root] = -1
+        node = self.heap.pop()
+        key = self.keys.pop()
+        if self.heap:
+            self.__sift_down(0, node, key)
+        return root
+
+    def __reserve(self, node: int) -> None:
+        self.positions.extend([-1] * (max(node + 1, 2 * len(self.positions)) - len(self.positions)))
+
+    # the parents with larger keys move down a level until the node's place is found, then the node is written once
+    def __sift_up(self, index: int, node: int, key: float) -> None:
+        heap, keys, positions, arity = self.heap, self.keys, self.positions, self.arity
+        while index > 0:
+            parent = (index - 1) // arity
+            parent_key = keys[parent]
+            if parent_key <= key:
+                break
+            parent_node = heap[parent]
+            heap[index] = parent_node
+            keys[index] = parent_key
+            positions[parent_node] = index
+            index = parent
+        heap[index] = node
+        keys[index] = key
+        positions[node] = index
+
+    # the smallest child moves up a level until the node's place is found
+    def __sift_down(self, index: int, node: int, key: float) -> None:
+        heap, keys, positions, arity = self.heap, self.keys, self.positions, self.arity
+        size = len(heap)
+        first = index * arity + 1
+        while first < size:
+            smallest = first
+            smallest_key = keys[first]
+            for child in range(first + 1, min(first + arity, size)):
+                if keys[child] < smallest_key:
+                    smallest = child
+                    smallest_key = keys[child]
+            if smallest_key >= key:
+                break
+            smallest_node = heap[smallest]
+            heap[index] = smallest_node
+            keys[index] = smallest_key
+            positions[smallest_node] = index
+            index = smallest
+            first = index * arity + 1
+        heap[index] = node
+        keys[index] = key
+        positions[node] = index
+
+
+# a monotone bucket queue (Dial's algorithm) for int keys that never go below the last key popped, which holds for
+# dijkstra and for a_star with a consistent heuristic when the edge costs are non-negative ints, the buckets are a
+# circular array with one bucket per key from the current key up, lowering a key leaves the old entry behind to be
+# skipped when its bucket comes up, the current key only ever moves forward, so finding the next bucket costs one step
+# per key passed over the whole search, and the array doubles if a key falls beyond its end
+class BucketQueue:
+
+    __slots__ = ['buckets', 'mask', 'keys', 'current', 'size']
+
+    def __init__(self, capacity: int=0, span: int=1024) -> None:
+        assert span > 0 and span & (span - 1) == 0, 'span must be a power of two'
+        buckets: list[list[int]] = [[] for _ in range(span)]
+        keys: list[int] = [-1] * capacity
+        self.buckets = buckets
+        self.mask = span - 1
+        self.keys = keys
+        self.current = 0
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, node: int) -> bool:
+        return node < len(self.keys) and self.keys[node] >= 0
+
+    def empty(self) -> bool:
+        return self.size == 0
+
+    def key(self, node: int) -> int:
+        if node not in self:
+            raise ValueError(f'no element {node} in queue')
+        return self.keys[node]
+
+    def insert(self, node: int, key: int) -> None:
+        if node >= len(self.keys):
+            self.keys.extend([-1] * (max(node + 1, 2 * len(self.keys)) - len(self.keys)))
+        if self.keys[node] >= 0:
+            raise ValueError(f'duplicate element {node}')
+        self.size += 1
+        self.__push(node, key)
+
+    def decrease_key(self, node: int, key: int) -> None:
+        if node not in self:
+            self.insert(node, key)
+            return
+        if key >= self.keys[node]:
+            raise ValueError(f'could not decrease key to a non-lower value for {node}')
+        self.__push(node, key)
+
+    def find_min(self) -> int:
+        if self.size == 0:
+            raise ValueError('no elements in queue to find min')
+        self.__advance()
+        return self.buckets[self.current & self.mask][-1]
+
+    def delete_min(self) -> None:
+        if self.size == 0:
+            raise ValueError('no elements in queue to delete min')
+        self.pop_min()
+
+    def pop_min(self) -> int:
+        if self.size == 0:
+            raise ValueError('no elements in queue to pop min')
+        self.__advance()
+        node = self.buckets[self.current & self.mask].pop()
+        self.keys[node] = -1
+        self.size -= 1
+        return node
+
+    def __push(self, node: int, key: int) -> None:
+        if type(key) != int or key < self.current:
+            raise ValueError(f'key {key} for {node} is not an int at least the last key popped, {self.current}')
+        if key - self.current > self.mask:
+            self.__grow(key - self.current + 1)
+        self.keys[node] = key
+        self.buckets[key & self.mask].append(node)
+
+    # a larger array, with the live nodes moved to their buckets in it and the entries left behind dropped
+    def __grow(self, span: int) -> None:
+        size = len(self.buckets)
+        while size < span:
+            size *= 2
+        nodes = {node for bucket in self.buckets for node in bucket if self.keys[node] >= 0}
+        self.buckets = [[] for _ in range(size)]
+        self.mask = size - 1
+        for node in nodes:
+            self.buckets[self.keys[node] & self.mask].append(node)
+
+    # drops entries left behind by decrease_key and moves past empty buckets until the top of the current bucket is a
+    # live node, every entry in the current bucket that isn't a node with the current key is one left behind
+    def __advance(self) -> None:
+        buckets, keys, mask, current = self.buckets, self.keys, self.mask, self.current
+        while True:
+            bucket = buckets[current & mask]
+            while bucket and keys[bucket[-1]] != current:
+                bucket.pop()
+            if bucket:
+                self.current = current
+                return
+            current += 1
+
+
+# a graph compiled to compressed sparse row arrays, nodes are ints from 0, and the edges out of a node are the targets
+# from starts[node] to starts[node + 1] with the matching weights
+class Graph:
+
+    __slots__ = ['starts', 'targets', 'weights']
+
+    def __init__(self, starts: array, targets: array, weights: array) -> None:
+        assert len(targets) == len(weights) == starts[-1]
+        self.starts = starts
+        self.targets = targets
+        self.weights = weights
+
+    @staticmethod
+    def from_edges(size: int, edges: list[tuple[int, int, int]]) -> 'Graph':
+        starts = array('i', [0]) * (size + 1)
+        for source, _, _ in edges:
+            starts[source + 1] += 1
+        for node in range(size):
+            starts[node + 1] += starts[node]
+        targets = array('i', [0]) * len(edges)
+        weights = array('q', [0]) * len(edges)
+        filled = starts[:-1]
+        for source, target, weight in edges:
+            targets[filled[source]] = target
+            weights[filled[source]] = weight
+            filled[source] += 1
+        return Graph(starts, targets, weights)
+
+    def __len__(self) -> int:
+        return len(self.starts) - 1
+
+    def edge_count(self) -> int:
+        return len(self.targets)
+
+    # in the form a_star takes, so a_star(start, goal, heuristic, graph.neighbours) searches the graph
+    def neighbours(self, node: int) -> list[tuple[int, int]]:
+        start, stop = self.starts[node], self.starts[node + 1]
+        return list(zip(self.targets[start:stop], self.weights[start:stop]))
+
+    # the same graph with every edge turned round, for searching back from a goal
+    def reversed(self) -> 'Graph':
+        edges: list[tuple[int, int, int]] = []
+        for source in range(len(self)):
+            for edge in range(self.starts[source], self.starts[source + 1]):
+                edges.append((self.targets[edge], source, self.weights[edge]))
+        return Graph.from_edges(len(self), edges)
+
+    # the cheapest of the edges from source to target, there may be more than one
+    def weight(self, source: int, target: int) -> int:
+        weights = [self.weights[edge] for edge in range(self.starts[source], self.starts[source + 1])
+                   if self.targets[edge] == target]
+        if not weights:
+            raise ValueError(f'no edge from {source} to {target}')
+        return min(weights)
+
+    def path_cost(self, path: list[int]) -> int:
+        return sum(self.weight(source, target) for source, target in zip(path, path[1:]))
+
+
 def reconstruct_path[T](came_from: dict[T, T],
                         current: T) -> list[T]:
     total_path: list[T] = [current]
@@ -137,16 +431,18 @@ def reconstruct_path[T](came_from: dict[T, T],
 def a_star[T](start: T,
               goal: Callable[[T], bool],
               heuristic: Callable[[T], int],
-              neighbours: Callable[[T], list[tuple[T, int]]]) -> Optional[list[T]]:
-    open_set: BinaryMinHeap[T] = BinaryMinHeap()
-    open_set.insert(start, heuristic(start))
+              neighbours: Callable[[T], list[tuple[T, int]]],
+              queue: type[IndexedHeap] | type[BucketQueue]=IndexedHeap) -> Optional[list[T]]:
+    # the queue holds int ids, given to the elements in the order they are first seen
+    ids: dict[T, int] = {start: 0}
+    elements: list[T] = [start]
+    open_set = queue()
+    open_set.insert(0, heuristic(start))
     came_from: dict[T, T] = {}
     g_score: dict[T, float] = defaultdict(lambda: math.inf)
     g_score[start] = 0
-    f_score: dict[T, float] = defaultdict(lambda: math.inf)
-    f_score[start] = heuristic(start)
     while not open_set.empty():
-        current: T = open_set.pop_min()
+        current: T = elements[open_set.pop_min()]
         if goal(current):
             return reconstruct_path(came_from, current)
         for neighbor, cost in neighbours(current):
@@ -155,32 +451,205 @@ def a_star[T](start: T,
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g_score
                 neighbor_f_score = tentative_g_score + heuristic(neighbor)
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor)
-                open_set.decrease_key(neighbor, neighbor_f_score)
+                if neighbor not in ids:
+                    ids[neighbor] = len(elements)
+                    elements.append(neighbor)
+                open_set.decrease_key(ids[neighbor], neighbor_f_score)
     return None
 
 
 def reachable[T](start: T,
                  goal: Callable[[T], bool],
                  heuristic: Callable[[T], int],
-                 neighbours: Callable[[T], list[tuple[T, int]]]) -> bool:
-    open_set: BinaryMinHeap[T] = BinaryMinHeap()
-    open_set.insert(start, heuristic(start))
-    came_from: dict[T, T] = {}
+                 neighbours: Callable[[T], list[tuple[T, int]]],
+                 queue: type[IndexedHeap] | type[BucketQueue]=IndexedHeap) -> bool:
+    # the queue holds int ids, given to the elements in the order they are first seen
+    ids: dict[T, int] = {start: 0}
+    elements: list[T] = [start]
+    open_set = queue()
+    open_set.insert(0, heuristic(start))
     g_score: dict[T, float] = defaultdict(lambda: math.inf)
     g_score[start] = 0
-    f_score: dict[T, float] = defaultdict(lambda: math.inf)
-    f_score[start] = heuristic(start)
     while not open_set.empty():
-        current: T = open_set.pop_min()
+        current: T = elements[open_set.pop_min()]
         if goal(current):
             return True
         for neighbor, cost in neighbours(current):
             tentative_g_score = g_score[current] + cost
             if tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
                 g_score[neighbor] = tentative_g_score
                 neighbor_f_score = tentative_g_score + heuristic(neighbor)
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor)
-                open_set.decrease_key(neighbor, neighbor_f_score)
+                if neighbor not in ids:
+                    ids[neighbor] = len(elements)
+                    elements.append(neighbor)
+                open_set.decrease_key(ids[neighbor], neighbor_f_score)
     return False
+
+
+# a_star over a compiled graph, the scores and parents are flat arrays indexed by node rather than dicts, and the
+# edges are read straight from the graph's arrays
+def a_star_graph(graph: Graph,
+                 start: int,
+                 goal: Callable[[int], bool],
+                 heuristic: Callable[[int], int],
+                 queue: type[IndexedHeap] | type[BucketQueue]=IndexedHeap) -> Optional[list[int]]:
+    starts, targets, weights = graph.starts, graph.targets, graph.weights
+    open_set = queue(len(graph))
+    open_set.insert(start, heuristic(start))
+    came_from = array('i', [-1]) * len(graph)
+    g_score: list[float] = [math.inf] * len(graph)
+    g_score[start] = 0
+    while not open_set.empty():
+        current: int = open_set.pop_min()
+        if goal(current):
+            path: list[int] = [current]
+            while came_from[path[-1]] >= 0:
+                path.append(came_from[path[-1]])
+            return path[::-1]
+        current_g_score = g_score[current]
+        for edge in range(starts[current], starts[current + 1]):
+            neighbor = targets[edge]
+            tentative_g_score = current_g_score + weights[edge]
+            if tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                open_set.decrease_key(neighbor, tentative_g_score + heuristic(neighbor))
+    return None
+
+
+# every optimal path from the start to a goal at once, as the predecessors of each node that lie on an optimal path to
+# it, following predecessors back from the goals visits only nodes that lie on an optimal path
+class PathDag:
+
+    __slots__ = ['start', 'goals', 'cost', 'predecessors']
+
+    def __init__(self, start: int, goals: list[int], cost: float, predecessors: dict[int, list[int]]) -> None:
+        self.start = start
+        self.goals = goals
+        self.cost = cost
+        self.predecessors = predecessors
+
+    # the nodes on any optimal path, each predecessor is visited once
+    def nodes(self) -> set[int]:
+        rv: set[int] = set(self.goals)
+        stack: list[int] = list(rv)
+        while stack:
+            for predecessor in self.predecessors.get(stack.pop(), []):
+                if predecessor not in rv:
+                    rv.add(predecessor)
+                    stack.append(predecessor)
+        return rv
+
+    # the nodes on any optimal path, each after all of its predecessors, by depth first search back from the goals
+    def order(self) -> list[int]:
+        rv: list[int] = []
+        seen: set[int] = set()
+        for goal in self.goals:
+            if goal in seen:
+                continue
+            seen.add(goal)
+            stack: list[tuple[int, int]] = [(goal, 0)]
+            while stack:
+                node, next_predecessor = stack.pop()
+                predecessors = self.predecessors.get(node, [])
+                if next_predecessor < len(predecessors):
+                    stack.append((node, next_predecessor + 1))
+                    predecessor = predecessors[next_predecessor]
+                    if predecessor not in seen:
+                        seen.add(predecessor)
+                        stack.append((predecessor, 0))
+                else:
+                    rv.append(node)
+        return rv
+
+    def count_paths(self) -> int:
+        counts: dict[int, int] = {}
+        for node in self.order():
+            counts[node] = 1 if node == self.start else sum(counts[p] for p in self.predecessors.get(node, []))
+        return sum(counts[goal] for goal in self.goals)
+
+
+# a_star_graph that keeps every predecessor giving a node its best score rather than the first found, and carries on
+# past the first goal until every node that could tie with it has been expanded, the heuristic must be consistent and
+# zero at the goals, and the edge costs positive, so the predecessors can't form a cycle
+def a_star_all(graph: Graph,
+               start: int,
+               goal: Callable[[int], bool],
+               heuristic: Callable[[int], int],
+               queue: type[IndexedHeap] | type[BucketQueue]=IndexedHeap) -> Optional[PathDag]:
+    starts, targets, weights = graph.starts, graph.targets, graph.weights
+    open_set = queue(len(graph))
+    open_set.insert(start, heuristic(start))
+    predecessors: dict[int, list[int]] = {}
+    g_score: list[float] = [math.inf] * len(graph)
+    g_score[start] = 0
+    goals: list[int] = []
+    best: float = math.inf
+    while not open_set.empty() and open_set.key(open_set.find_min()) <= best:
+        current: int = open_set.pop_min()
+        if goal(current):
+            best = g_score[current]
+            goals.append(current)
+            continue
+        current_g_score = g_score[current]
+        for edge in range(starts[current], starts[current + 1]):
+            neighbor = targets[edge]
+            tentative_g_score = current_g_score + weights[edge]
+            if tentative_g_score < g_score[neighbor]:
+                predecessors[neighbor] = [current]
+                g_score[neighbor] = tentative_g_score
+                open_set.decrease_key(neighbor, tentative_g_score + heuristic(neighbor))
+            elif tentative_g_score == g_score[neighbor]:
+                predecessors[neighbor].append(current)
+    if not goals:
+        return None
+    return PathDag(start, goals, best, predecessors)
+
+
+# dijkstra from the start and back from the goal at the same time, expanding whichever side has the smaller open set,
+# reverse_neighbours gives the nodes with an edge into a node and the cost of that edge (for a compiled graph that is
+# graph.reversed().neighbours), best is the cheapest path through a node both sides have reached, and once the two
+# smallest open keys add up to at least best no path can be cheaper, the path is in the same form a_star returns
+def bidirectional[T](start: T,
+                     goal: T,
+                     neighbours: Callable[[T], list[tuple[T, int]]],
+                     reverse_neighbours: Callable[[T], list[tuple[T, int]]],
+                     queue: type[IndexedHeap] | type[BucketQueue]=IndexedHeap) -> Optional[list[T]]:
+    if start == goal:
+        return [start]
+    # both queues hold int ids, given to the elements in the order they are first seen by either side
+    ids: dict[T, int] = {start: 0, goal: 1}
+    elements: list[T] = [start, goal]
+    open_sets = queue(), queue()
+    open_sets[0].insert(0, 0)
+    open_sets[1].insert(1, 0)
+    came_from: tuple[dict[T, T], dict[T, T]] = {}, {}
+    g_scores: tuple[dict[T, float], dict[T, float]] = {start: 0}, {goal: 0}
+    expand = neighbours, reverse_neighbours
+    best: float = math.inf
+    meeting: Optional[T] = None
+    while not open_sets[0].empty() and not open_sets[1].empty():
+        if open_sets[0].key(open_sets[0].find_min()) + open_sets[1].key(open_sets[1].find_min()) >= best:
+            break
+        side = 0 if len(open_sets[0]) <= len(open_sets[1]) else 1
+        g_score, other_g_score = g_scores[side], g_scores[1 - side]
+        current: T = elements[open_sets[side].pop_min()]
+        for neighbor, cost in expand[side](current):
+            tentative_g_score = g_score[current] + cost
+            if tentative_g_score < g_score.get(neighbor, math.inf):
+                came_from[side][neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                if neighbor not in ids:
+                    ids[neighbor] = len(elements)
+                    elements.append(neighbor)
+                open_sets[side].decrease_key(ids[neighbor], tentative_g_score)
+                if neighbor in other_g_score and tentative_g_score + other_g_score[neighbor] < best:
+                    best = tentative_g_score + other_g_score[neighbor]
+                    meeting = neighbor
+    if meeting is None:
+        return None
+    # the backward search's came_from points from a node to the next node on the way to the goal
+    path = reconstruct_path(came_from[0], meeting)
+    while path[-1] in came_from[1]:
+        path.append(came_from[1][path[-1]])
+    return path
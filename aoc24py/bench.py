@@ -0,0 +1,244 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import argparse
+import contextlib
+import gc
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict, field
+from types import ModuleType
+from typing import Callable, Optional
+
+import inputcache
+import inputs
+from days import load_day, parse_days
+from history import DEFAULT_HISTORY, append_records
+from memory import format_bytes, max_rss_bytes, traced
+from runner import find_value
+from timing import PhaseTimer
+
+
+GC_MODES = ('enabled', 'disabled', 'frozen')
+
+
+@dataclass
+class Benchmark:
+    day: int
+    runs: int
+    warmup: int
+    gc: str
+    python: str
+    samples_ns: list[int]
+    mean_ns: float
+    stdev_ns: float
+    min_ns: int
+    median_ns: float
+    part1: Optional[str]
+    part2: Optional[str]
+    phases_ns: dict[str, list[int]] = field(default_factory=dict)
+    peak_bytes: Optional[int] = None
+    max_rss_bytes: Optional[int] = None
+    phases_peak_bytes: dict[str, int] = field(default_factory=dict)
+    errors: list[str] = field(default_factory=list)
+
+
+def input_filename(day: int) -> str:
+    return f'input{day:02}.txt'
+
+
+def load_answers(filename: str) -> dict[str, dict[str, str]]:
+    if not os.path.exists(filename):
+        return {}
+    with open(filename) as file:
+        return json.load(file)
+
+
+def clear_caches(module: ModuleType) -> None:
+    for value in vars(module).values():
+        if callable(getattr(value, 'cache_clear', None)):
+            value.cache_clear()
+
+
+def run_once(function: Callable[[], PhaseTimer]) -> tuple[int, str, PhaseTimer]:
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        start: int = time.perf_counter_ns()
+        timer: PhaseTimer = function()
+        stop: int = time.perf_counter_ns()
+    return stop - start, buffer.getvalue(), timer
+
+
+def check_answers(output: str, expected: dict[str, str]) -> list[str]:
+    errors: list[str] = []
+    for part, prefix in (('part1', 'Part 1:'), ('part2', 'Part 2:')):
+        actual: Optional[str] = find_value(output, prefix)
+        if part in expected and actual != expected[part]:
+            errors.append(f'{part} was {actual}, expected {expected[part]}')
+    return errors
+
+
+# runs in a worker process, so the input override and cache setting come from the environment it inherits
+def traced_run(day: int) -> tuple[Optional[int], Optional[int], dict[str, int]]:
+    function: Callable[[], PhaseTimer] = load_day(day)
+    with traced():
+        _, _, timer = run_once(function)
+    return timer.peak_bytes(), max_rss_bytes(), {phase.name: phase.peak_bytes for phase in timer.phases}
+
+
+def benchmark(day: int, runs: int, warmup: int, gc_mode: str, keep_caches: bool,
+              expected: dict[str, str], memory: bool=False) -> Benchmark:
+
+    assert gc_mode in GC_MODES, f'unknown gc mode {gc_mode}'
+    assert runs > 0
+
+    function: Callable[[], PhaseTimer] = load_day(day)
+    module: ModuleType = sys.modules[function.__module__]
+
+    output: str = ''
+    for _ in range(warmup):
+        if not keep_caches:
+            clear_caches(module)
+        _, output, _ = run_once(function)
+
+    gc.collect()
+    if gc_mode == 'frozen':
+        gc.freeze()
+    samples: list[int] = []
+    phases: dict[str, list[int]] = {}
+    errors: list[str] = []
+    try:
+        for _ in range(runs):
+            if not keep_caches:
+                clear_caches(module)
+            gc.collect()
+            if gc_mode == 'disabled':
+                gc.disable()
+            try:
+                sample, output, timer = run_once(function)
+            finally:
+                gc.enable()
+            samples.append(sample)
+            for phase in timer.phases:
+                phases.setdefault(phase.name, []).append(phase.wall_ns)
+            for error in check_answers(output, expected):
+                if error not in errors:
+                    errors.append(error)
+    finally:
+        if gc_mode == 'frozen':
+            gc.unfreeze()
+
+    # memory is measured on one extra run, as tracing would distort the timed runs, in a fresh worker process, as max
+    # RSS is the high-water mark of the whole process and this one has already run the timed runs and earlier days
+    peak_bytes: Optional[int] = None
+    rss_bytes: Optional[int] = None
+    phases_peak_bytes: dict[str, int] = {}
+    if memory:
+        with ProcessPoolExecutor(max_workers=1, max_tasks_per_child=1) as executor:
+            peak_bytes, rss_bytes, phases_peak_bytes = executor.submit(traced_run, day).result()
+
+    return Benchmark(day=day,
+                     runs=runs,
+                     warmup=warmup,
+                     gc=gc_mode,
+                     python=f'{platform.python_implementation()} {platform.python_version()}',
+                     samples_ns=samples,
+                     mean_ns=statistics.mean(samples),
+                     stdev_ns=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+                     min_ns=min(samples),
+                     median_ns=statistics.median(samples),
+                     part1=find_value(output, 'Part 1:'),
+                     part2=find_value(output, 'Part 2:'),
+                     phases_ns=phases,
+                     peak_bytes=peak_bytes,
+                     max_rss_bytes=rss_bytes,
+                     phases_peak_bytes=phases_peak_bytes,
+                     errors=errors)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Advent of Code 2024 - in-process benchmark')
+    parser.add_argument('day', help="the day to benchmark, or 'all', or a list of days and ranges such as 1,3,7-12")
+    parser.add_argument('--runs', type=int, default=10, help='number of measured runs')
+    parser.add_argument('--warmup', type=int, default=1, help='number of unmeasured runs before measuring')
+    parser.add_argument('--gc', choices=GC_MODES, default='enabled',
+                        help='run with the garbage collector enabled, disabled during runs, or frozen after warmup')
+    parser.add_argument('--keep-caches', action='store_true',
+                        help="don't clear the day's functools caches between runs")
+    parser.add_argument('--phases', action='store_true', help='report the mean time taken by each phase')
+    parser.add_argument('--cache', action='store_true',
+                        help='load parsed inputs from the input cache, so the parse phase measures loading the cache')
+    parser.add_argument('--memory', action='store_true',
+                        help='do one extra run tracing memory, reporting the peak and max RSS')
+    parser.add_argument('--input', metavar='PATH',
+                        help='read inputs from this directory, or read the day\'s input from this file, or from stdin if -')
+    parser.add_argument('--answers', default='answers.json', help='expected answers file, keyed by input file name')
+    parser.add_argument('--output', help='write the results to this JSON file')
+    parser.add_argument('--history', nargs='?', const=DEFAULT_HISTORY,
+                        help=f'append the results to the benchmark history (default {DEFAULT_HISTORY})')
+    return parser.parse_args()
+
+
+def main() -> None:
+
+    arguments = parse_arguments()
+
+    try:
+        days = parse_days(arguments.day)
+    except ValueError:
+        print('invalid day', file=sys.stderr)
+        sys.exit(1)
+    if arguments.runs < 1 or arguments.warmup < 0:
+        print('invalid number of runs', file=sys.stderr)
+        sys.exit(1)
+
+    if arguments.cache:
+        inputcache.enable()
+
+    if arguments.input is not None:
+        inputs.set_input(arguments.input)
+
+    answers = load_answers(arguments.answers)
+
+    results: list[Benchmark] = []
+    for day in days:
+        result = benchmark(day, arguments.runs, arguments.warmup, arguments.gc, arguments.keep_caches,
+                           answers.get(os.path.basename(inputs.input_path(input_filename(day))), {}), arguments.memory)
+        results.append(result)
+        status = 'answers ok' if not result.errors else '; '.join(result.errors)
+        print(f'Day {day:2}: {result.mean_ns / 1000:,.0f} ± {result.stdev_ns / 1000:,.0f} μs'
+              f' (min {result.min_ns / 1000:,.0f} μs, median {result.median_ns / 1000:,.0f} μs,'
+              f' {result.runs} runs) - {status}')
+        if arguments.memory:
+            print(f'    peak {format_bytes(result.peak_bytes)}, max rss {format_bytes(result.max_rss_bytes)}')
+        if arguments.phases:
+            for name, phase_samples in result.phases_ns.items():
+                line = f'    {name + ":":<20} {statistics.mean(phase_samples) / 1000:,.0f} μs'
+                if name in result.phases_peak_bytes:
+                    line += f', peak {format_bytes(result.phases_peak_bytes[name])}'
+                print(line)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            json.dump([asdict(result) for result in results], file, indent=2)
+
+    if arguments.history:
+        append_records(arguments.history, [asdict(result) for result in results])
+
+    if any(result.errors for result in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
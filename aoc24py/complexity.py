@@ -0,0 +1,227 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import argparse
+import csv
+import math
+import os
+import signal
+import sys
+import tempfile
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+from bench import benchmark, input_filename
+from days import parse_days
+from generate import GENERATORS, generate
+
+try:
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+except ImportError:
+    plt = None
+
+
+class TimedOut(Exception):
+    pass
+
+
+@contextmanager
+def time_limit(seconds: float) -> Iterator[None]:
+    # only available where there is SIGALRM, elsewhere a run that blows up has to be interrupted by hand
+    if seconds <= 0 or not hasattr(signal, 'SIGALRM'):
+        yield
+        return
+
+    def handler(signum, frame):
+        raise TimedOut()
+
+    previous = signal.signal(signal.SIGALRM, handler)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+@dataclass
+class Point:
+    size: int
+    input_bytes: int
+    median_ns: float
+    min_ns: int
+    phases_ns: dict[str, float] = field(default_factory=dict)
+
+
+@dataclass
+class Curve:
+    day: int
+    parameter: str
+    points: list[Point]
+    timed_out: Optional[int] = None
+
+
+def geometric_sizes(start: int, factor: float, count: int) -> list[int]:
+    rv: list[int] = []
+    for i in range(count):
+        size = max(1, round(start * factor ** i))
+        if not rv or size > rv[-1]:
+            rv.append(size)
+    return rv
+
+
+# least squares slope of log time against log size, the k in time ~ size^k
+def growth_exponent(sizes: list[float], times: list[float]) -> Optional[float]:
+    pairs = [(math.log(s), math.log(t)) for s, t in zip(sizes, times) if s > 0 and t > 0]
+    if len(pairs) < 2:
+        return None
+    mean_x = sum(x for x, _ in pairs) / len(pairs)
+    mean_y = sum(y for _, y in pairs) / len(pairs)
+    denominator = sum((x - mean_x) ** 2 for x, _ in pairs)
+    if denominator == 0:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in pairs) / denominator
+
+
+def measure(day: int, parameter: str, sizes: list[int], seed: int, runs: int, budget: float) -> Curve:
+    rv = Curve(day, parameter, [])
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        # the days open their input relative to the working directory
+        filename = os.path.join(directory, input_filename(day))
+        os.chdir(directory)
+        try:
+            for size in sizes:
+                with open(filename, 'w') as file:
+                    file.write(generate(day, seed, **{parameter: size}))
+                try:
+                    with time_limit(budget * runs):
+                        result = benchmark(day, runs, 0, 'enabled', False, {})
+                except TimedOut:
+                    rv.timed_out = size
+                    break
+                rv.points.append(Point(size, os.path.getsize(filename), result.median_ns, result.min_ns,
+                                       {name: sorted(samples)[len(samples) // 2]
+                                        for name, samples in result.phases_ns.items()}))
+                print(f'Day {day} {parameter} = {size} done in {result.median_ns / 1e9:.3f} s', file=sys.stderr)
+                # stop growing once a run takes longer than the budget, the next size would take longer still
+                if result.median_ns > budget * 1e9:
+                    break
+        finally:
+            os.chdir(cwd)
+    return rv
+
+
+def exponents(curve: Curve) -> dict[str, Optional[float]]:
+    sizes = [point.size for point in curve.points]
+    rv: dict[str, Optional[float]] = {'total': growth_exponent(sizes, [point.median_ns for point in curve.points])}
+    for name in curve.points[0].phases_ns if curve.points else []:
+        rv[name] = growth_exponent(sizes, [point.phases_ns.get(name, 0) for point in curve.points])
+    return rv
+
+
+def format_exponent(exponent: Optional[float]) -> str:
+    return '?' if exponent is None else f'n^{exponent:.2f}'
+
+
+def print_curve(curve: Curve) -> None:
+    sizes = ', '.join(str(point.size) for point in curve.points)
+    print(f'Day {curve.day:2} ({curve.parameter} = {sizes})')
+    for name, exponent in exponents(curve).items():
+        print(f'    {name + ":":<20} {format_exponent(exponent)}')
+    if curve.timed_out is not None:
+        print(f'    timed out at {curve.parameter} = {curve.timed_out}')
+
+
+def write_csv(curves: list[Curve], filename: str) -> None:
+    with open(filename, 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(['day', 'parameter', 'size', 'input_bytes', 'phase', 'median_ns', 'min_ns'])
+        for curve in curves:
+            for point in curve.points:
+                writer.writerow([curve.day, curve.parameter, point.size, point.input_bytes, 'total',
+                                 point.median_ns, point.min_ns])
+                for name, median_ns in point.phases_ns.items():
+                    writer.writerow([curve.day, curve.parameter, point.size, point.input_bytes, name, median_ns, ''])
+
+
+def plot(curves: list[Curve], filename: str) -> None:
+    assert plt is not None
+    figure, axes = plt.subplots(figsize=(8, 6))
+    for curve in curves:
+        if curve.points:
+            exponent = exponents(curve)['total']
+            axes.plot([point.size for point in curve.points], [point.median_ns / 1e9 for point in curve.points],
+                      marker='o', label=f'day {curve.day} ({curve.parameter}, {format_exponent(exponent)})')
+    axes.set_xscale('log')
+    axes.set_yscale('log')
+    axes.set_xlabel('input size')
+    axes.set_ylabel('median time (s)')
+    axes.legend()
+    figure.savefig(filename)
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Advent of Code 2024 - growth of run time with input size')
+    parser.add_argument('day', help="the day to measure, or 'all', or a list of days and ranges such as 1,3,7-12")
+    parser.add_argument('--parameter', help="the generator parameter to grow, defaults to each day's scale parameter")
+    parser.add_argument('--start', type=int, help='the smallest size, defaults to a quarter of the default size')
+    parser.add_argument('--factor', type=float, default=2.0, help='ratio between successive sizes')
+    parser.add_argument('--points', type=int, default=5, help='number of sizes')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the generated inputs')
+    parser.add_argument('--runs', type=int, default=3, help='number of measured runs at each size')
+    parser.add_argument('--budget', type=float, default=10.0,
+                        help='seconds per run, a day stops growing once a run takes longer than this, and a size is '
+                             'abandoned if all its runs together take longer than this times the number of runs')
+    parser.add_argument('--csv', help='write every measurement to this CSV file')
+    parser.add_argument('--plot', help='write a log-log plot to this image file (needs matplotlib)')
+    return parser.parse_args()
+
+
+def main() -> None:
+
+    arguments = parse_arguments()
+
+    try:
+        days = parse_days(arguments.day)
+    except ValueError:
+        print('invalid day', file=sys.stderr)
+        sys.exit(1)
+    if arguments.runs < 1 or arguments.points < 1 or arguments.factor <= 1:
+        print('invalid runs, points or factor', file=sys.stderr)
+        sys.exit(1)
+    if arguments.plot and plt is None:
+        print('--plot needs matplotlib', file=sys.stderr)
+        sys.exit(1)
+
+    curves: list[Curve] = []
+    for day in days:
+        generator = GENERATORS[day]
+        parameter: str = arguments.parameter or generator.scale
+        if parameter not in generator.parameters:
+            print(f'day {day} has no parameter {parameter}', file=sys.stderr)
+            sys.exit(1)
+        start: int = arguments.start or max(1, generator.parameters[parameter] // 4)
+        sizes = geometric_sizes(start, arguments.factor, arguments.points)
+        curve = measure(day, parameter, sizes, arguments.seed, arguments.runs, arguments.budget)
+        curves.append(curve)
+        print_curve(curve)
+
+    if arguments.csv:
+        write_csv(curves, arguments.csv)
+
+    if arguments.plot:
+        plot(curves, arguments.plot)
+
+
+if __name__ == "__main__":
+    main()
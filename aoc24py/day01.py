@@ -7,44 +7,44 @@
 
 
 from collections import Counter
-import time
-from collections.abc import Iterable
 
+from inputcache import cached_parse
+from inputs import integers
+from timing import PhaseTimer
 
-def pairs() -> Iterable[tuple[[int, int]]]:
-    with open('input01.txt') as file:
-        for line in file:
-            line = line.strip()
-            line = [int(e) for e in line.split()]
-            l, r = line
-            yield l, r
 
+def read_lists(filename: str) -> tuple[list[int], list[int]]:
+    values = integers(filename)
+    assert len(values) % 2 == 0
+    left: list[int] = values[0::2].tolist()
+    right: list[int] = values[1::2].tolist()
+    return left, right
 
-def day01() -> None:
 
-    start: float = time.perf_counter()
+def day01() -> PhaseTimer:
 
-    left: list[int] = []
-    right: list[int] = []
-    for l, r in pairs():
-        left.append(l)
-        right.append(r)
+    timer = PhaseTimer()
 
-    left.sort()
-    right.sort()
+    with timer.phase('parse'):
+        left, right = cached_parse('input01.txt', read_lists, 3)
 
-    r_counts: Counter[int] = Counter(right)
+    with timer.phase('solve'):
 
-    part1: int = 0
-    part2: int = 0
-    for l, r in zip(left, right):
-        part1 += abs(l - r)
-        part2 += l * r_counts[l]
+        left.sort()
+        right.sort()
 
-    stop: float = time.perf_counter()
+        r_counts: Counter[int] = Counter(right)
+
+        part1: int = 0
+        part2: int = 0
+        for l, r in zip(left, right):
+            part1 += abs(l - r)
+            part2 += l * r_counts[l]
 
     print("Advent of Code 2024")
     print("Day 1 - Historian Hysteria")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
@@ -6,15 +6,20 @@
 # Website:  leechristie.com
 
 
-import time
 from collections.abc import Iterable
 
+from inputcache import cached_parse
+from inputs import lines
+from timing import PhaseTimer
 
-def reports() -> Iterable[list[int]]:
-    with open('input02.txt') as file:
-        for line in file:
-            line = line.strip()
-            yield [int(e) for e in line.split()]
+
+def reports(filename: str) -> Iterable[list[int]]:
+    for line in lines(filename):
+        yield [int(e) for e in line.split()]
+
+
+def read_reports(filename: str) -> list[list[int]]:
+    return list(reports(filename))
 
 
 def is_safe(report: list[int]) -> bool:
@@ -45,24 +50,28 @@ def unsafe_report_is_repairable(report: list[int]) -> bool:
     return False
 
 
-def day02() -> None:
+def day02() -> PhaseTimer:
 
-    start: float = time.perf_counter()
+    timer = PhaseTimer()
 
-    part1 = 0
-    part2 = 0
-    for report in reports():
-        if is_safe(report):
-            part1 += 1
-            part2 += 1
-        else:
-            if unsafe_report_is_repairable(report):
-                part2 += 1
+    with timer.phase('parse'):
+        all_reports: list[list[int]] = cached_parse('input02.txt', read_reports, 2)
 
-    stop: float = time.perf_counter()
+    with timer.phase('solve'):
+        part1 = 0
+        part2 = 0
+        for report in all_reports:
+            if is_safe(report):
+                part1 += 1
+                part2 += 1
+            else:
+                if unsafe_report_is_repairable(report):
+                    part2 += 1
 
     print("Advent of Code 2024")
     print("Day 2 - Red-Nosed Reports")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
@@ -6,46 +6,56 @@
 # Website:  leechristie.com
 
 
-import time
 import re
 
-
-def get_file() -> str:
-    all_lines = ''
-    with open('input03.txt') as file:
-        for line in file:
-            all_lines += line
-    return all_lines
-
-
-def day03() -> None:
-
-    start: float = time.perf_counter()
-
-    part1: int = 0
-    part2: int = 0
-
-    all_lines = get_file()
-    pattern = re.compile(r"mul\((\d\d?\d?),(\d\d?\d?)\)|do\(\)|don't\(\)")
-    enabled = True
-    for match in re.finditer(pattern, all_lines):
-        match_string = all_lines[match.start():match.end()]
-        if match_string == 'do()':
-            enabled = True
-        elif match_string == "don't()":
-            enabled = False
-        else:
-            first, second = match.groups()
-            value = int(first) * int(second)
-            part1 += value
-            if enabled:
-                part2 += value
-
-
-    stop: float = time.perf_counter()
+from inputcache import cached_parse
+from inputs import mapped
+from timing import PhaseTimer
+
+
+# the instructions as ('do', 0), ("don't", 0) or ('mul', product)
+def read_instructions(filename: str) -> list[tuple[str, int]]:
+    pattern = re.compile(rb"mul\((\d\d?\d?),(\d\d?\d?)\)|do\(\)|don't\(\)")
+    rv: list[tuple[str, int]] = []
+    # the pattern is matched against the mapped file, so the input is never read into a string
+    with mapped(filename) as buffer:
+        for match in pattern.finditer(buffer):
+            match_string = match.group()
+            if match_string == b'do()':
+                rv.append(('do', 0))
+            elif match_string == b"don't()":
+                rv.append(("don't", 0))
+            else:
+                first, second = match.groups()
+                rv.append(('mul', int(first) * int(second)))
+    return rv
+
+
+def day03() -> PhaseTimer:
+
+    timer = PhaseTimer()
+
+    with timer.phase('parse'):
+        instructions = cached_parse('input03.txt', read_instructions, 2)
+
+    with timer.phase('solve'):
+        part1: int = 0
+        part2: int = 0
+        enabled = True
+        for instruction, value in instructions:
+            if instruction == 'do':
+                enabled = True
+            elif instruction == "don't":
+                enabled = False
+            else:
+                part1 += value
+                if enabled:
+                    part2 += value
 
     print("Advent of Code 2024")
     print("Day 3 - Mull It Over")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
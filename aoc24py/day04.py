@@ -6,35 +6,91 @@
 # Website:  leechristie.com
 
 
-import time
+import re
 
+import ndgrid
 from grid import *
+from inputcache import cached_parse
+from ndgrid import ArrayGrid
+from timing import PhaseTimer
 
 
-def day04() -> None:
+# the four ways round the two crossed MAS can be
+X_MAS_PATTERNS = [['M.S',
+                   '.A.',
+                   'M.S'],
+                  ['M.M',
+                   '.A.',
+                   'S.S'],
+                  ['S.M',
+                   '.A.',
+                   'S.M'],
+                  ['S.S',
+                   '.A.',
+                   'M.M']]
 
-    start: float = time.perf_counter()
 
-    part1 = 0
-    part2 = 0
+# counts the word in every direction, holding only as many rows as the word is long
+def stream_count_word(filename: str, word: str) -> int:
+    forwards, backwards = tuple(word), tuple(reversed(word))
+    across = re.compile(f'(?={re.escape(word)})'), re.compile(f'(?={re.escape(word[::-1])})')
+    rv = 0
+    for y, rows in row_windows(filename, len(word)):
+        # across the newest row
+        rv += sum(len(pattern.findall(rows[-1])) for pattern in across)
+        if len(rows) < len(word):
+            continue
+        # down and along both diagonals, the columns of the window with each row slid over by its depth
+        for columns in (zip(*rows),
+                        zip(*(row[depth:] for depth, row in enumerate(rows))),
+                        zip(*(row[::-1][depth:] for depth, row in enumerate(rows)))):
+            for column in columns:
+                rv += (column == forwards) + (column == backwards)
+    return rv
 
-    grid = CharacterGrid.read_character_grid('input04.txt')
 
-    for y in range(grid.height):
-        for x in range(grid.width):
-            for stride in ALL_STRIDES:
-                if grid.characters_stride((y, x), stride, 4) == 'XMAS':
-                    part1 += 1
-            if grid[(y, x)] == 'A':
-                nw_to_se = grid.characters_stride((y-1, x-1), STRIDE_SOUTHEAST, 3)
-                ne_to_sw = grid.characters_stride((y-1, x+1), STRIDE_SOUTHWEST, 3)
-                if (nw_to_se == 'MAS' or nw_to_se == 'SAM') and (ne_to_sw == 'MAS' or ne_to_sw == 'SAM'):
-                    part2 += 1
+# counts the two MAS crossed in an X, holding only three rows
+def stream_count_x_mas(filename: str) -> int:
+    rv = 0
+    for y, rows in row_windows(filename, 3):
+        if len(rows) < 3:
+            continue
+        top, middle, bottom = rows
+        for top_left, top_right, centre, bottom_left, bottom_right in zip(top, top[2:], middle[1:], bottom, bottom[2:]):
+            if centre == 'A' and {top_left, bottom_right} == {'M', 'S'} and {top_right, bottom_left} == {'M', 'S'}:
+                rv += 1
+    return rv
 
-    stop: float = time.perf_counter()
+
+def day04() -> PhaseTimer:
+
+    timer = PhaseTimer()
+
+    # with numpy, search the whole grid at once by comparing shifted views of it
+    if ndgrid.available():
+
+        with timer.phase('parse'):
+            array_grid = cached_parse('input04.txt', ArrayGrid.read_array_grid, 1)
+
+        with timer.phase('part1'):
+            part1 = array_grid.count_word('XMAS')
+
+        with timer.phase('part2'):
+            part2 = sum(array_grid.count_pattern(pattern) for pattern in X_MAS_PATTERNS)
+
+    # without numpy, stream the grid through a window of rows, which also keeps memory bounded for huge grids
+    else:
+
+        with timer.phase('part1'):
+            part1 = stream_count_word('input04.txt', 'XMAS')
+
+        with timer.phase('part2'):
+            part2 = stream_count_x_mas('input04.txt')
 
     print("Advent of Code 2024")
     print("Day 4 - Ceres Search")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
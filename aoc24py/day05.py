@@ -6,35 +6,47 @@
 # Website:  leechristie.com
 
 
-import time
 from collections import defaultdict
 from functools import cmp_to_key
-from typing import Iterable, TextIO, Callable
+from typing import Iterable, Iterator, Callable
 
+from inputcache import cached_parse
+from inputs import lines
+from timing import PhaseTimer
 
-def read_header(file: TextIO) -> Iterable[tuple[int, int]]:
+
+def read_header(file: Iterator[bytes]) -> Iterable[tuple[int, int]]:
     for line in file:
         line = line.strip()
         if not line:
             break
-        assert '|' in line
-        a, b = line.split('|')
+        assert b'|' in line
+        a, b = line.split(b'|')
         a = int(a)
         b = int(b)
         yield a, b
 
 
-def read_body(file: TextIO) -> Iterable[list[int]]:
+def read_body(file: Iterator[bytes]) -> Iterable[list[int]]:
     for line in file:
         line = line.strip()
         if not line:
             break
-        assert ',' in line
-        items = [int(i) for i in line.split(',')]
+        assert b',' in line
+        items = [int(i) for i in line.split(b',')]
         assert len(items) % 2 == 1
         yield items
 
 
+def read_rules(filename: str) -> tuple[dict[int, list[int]], list[list[int]]]:
+    file = lines(filename)
+    orders: dict[int, list[int]] = defaultdict(list)
+    for a, b in read_header(file):
+        orders[a].append(b)
+    updates: list[list[int]] = list(read_body(file))
+    return orders, updates
+
+
 def correctly_ordered(items: list[int], orders: dict[int, list[int]]) -> bool:
     for i in range(0, len(items)-1):
         a = items[i]
@@ -66,18 +78,17 @@ def sort(items: list[int], cmp: Callable[[int, int], int]) -> bool:
     items.sort(key=cmp_to_key(cmp))
 
 
-def day05() -> None:
+def day05() -> PhaseTimer:
 
-    start: float = time.perf_counter()
+    timer = PhaseTimer()
 
-    part1 = 0
-    part2 = 0
+    with timer.phase('parse'):
+        orders, updates = cached_parse('input05.txt', read_rules, 2)
 
-    with open('input05.txt') as file:
-        orders: dict[int, list[int]] = defaultdict(list)
-        for a, b in read_header(file):
-            orders[a].append(b)
-        for items in read_body(file):
+    with timer.phase('solve'):
+        part1 = 0
+        part2 = 0
+        for items in updates:
             if correctly_ordered(items, orders):
                 part1 += middle_item(items)
             else:
@@ -85,11 +96,10 @@ def day05() -> None:
                 sort(items, cmp)
                 part2 += middle_item(items)
 
-
-    stop: float = time.perf_counter()
-
     print("Advent of Code 2024")
     print("Day 5 - Print Queue")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
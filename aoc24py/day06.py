@@ -6,70 +6,114 @@
 # Website:  leechristie.com
 
 
-import time
-
 from grid import *
+from inputcache import cached_parse
+from timing import PhaseTimer
 
 from collections import defaultdict
 from functools import cmp_to_key
 from typing import Iterable, TextIO, Callable
 
 
-def do_march(grid: MutableCharacterGrid, location: tuple[int, int]):
+OUTSIDE, FLOOR, WALL = ord(' '), ord('.'), ord('#')
+VISITED, CROSSING, UP_DOWN, LEFT_RIGHT = ord('X'), ord('+'), ord('|'), ord('-')
+
 
-    standing_on: str = grid[location]
-    velocity: tuple[int, int] = STRIDE_NORTH
+def do_march(grid: FlatGrid, location: int):
+
+    data: bytearray = grid.data
+    standing_on: int = data[location]
+    velocity: int = grid.offset(STRIDE_NORTH)
+    turn: dict[int, int] = {grid.offset(a): grid.offset(b) for a, b in ROTATE_CLOCKWISE.items()}
+    vertical: tuple[int, int] = (grid.offset(STRIDE_NORTH), grid.offset(STRIDE_SOUTH))
 
     part1 = 0
-    while standing_on is not None:
+    while standing_on != OUTSIDE:
         placed_x = False
-        if standing_on == '.':
-            grid[location] = 'X'
+        if standing_on == FLOOR:
+            data[location] = VISITED
             part1 += 1
             placed_x = True
-        new_y = location[0] + velocity[0]
-        new_x = location[1] + velocity[1]
-        new_location = new_y, new_x
-        if grid[new_location] == '#':
+        new_location = location + velocity
+        if data[new_location] == WALL:
             if placed_x:
-                grid[location] = '+'
-            velocity = ROTATE_CLOCKWISE[velocity]
+                data[location] = CROSSING
+            velocity = turn[velocity]
         else:
             if placed_x:
-                if velocity == STRIDE_NORTH or velocity == STRIDE_SOUTH:
-                    grid[location] = '|'
+                if velocity in vertical:
+                    data[location] = UP_DOWN
                 else:
-                    grid[location] = '-'
-            elif grid[location] == '-' and (velocity == STRIDE_NORTH or velocity == STRIDE_SOUTH):
-                grid[location] = '+'
-            elif grid[location] == '|' and not (velocity == STRIDE_NORTH or velocity == STRIDE_SOUTH):
-                grid[location] = '+'
+                    data[location] = LEFT_RIGHT
+            elif data[location] == LEFT_RIGHT and velocity in vertical:
+                data[location] = CROSSING
+            elif data[location] == UP_DOWN and velocity not in vertical:
+                data[location] = CROSSING
             location = new_location
-        standing_on = grid[location]
+        standing_on = data[location]
 
     return part1
 
 
-def day06() -> None:
-
-    start: float = time.perf_counter()
-
-    part1 = 0
+# the guard walks from obstacle to obstacle rather than cell by cell, it is in a loop once it turns at the same place
+# facing the same way twice, the rays are in clockwise order starting north, so turning right is the next ray
+def loops(grid: FlatGrid, rays: RayIndex, location: int) -> bool:
+    data: bytearray = grid.data
+    offsets: list[int] = rays.offsets
+    direction: int = 0
+    turns: set[int] = set()
+    while True:
+        obstacle = rays.next_obstacle(location, direction)
+        if data[obstacle] == OUTSIDE:
+            return False
+        location = obstacle - offsets[direction]
+        turn = location * 4 + direction
+        if turn in turns:
+            return True
+        turns.add(turn)
+        direction = (direction + 1) % 4
+
+
+# an obstruction only changes the guard's walk if it is somewhere on the original walk, other than where they start
+def count_obstructions(grid: FlatGrid, location: int) -> int:
+    rays = RayIndex(grid, chr(WALL))
+    trail = bytes([VISITED, CROSSING, UP_DOWN, LEFT_RIGHT])
+    rv = 0
+    for index in grid.cells():
+        if index != location and grid.data[index] in trail:
+            rays.add(index)
+            if loops(grid, rays, location):
+                rv += 1
+            rays.remove(index)
+    return rv
+
+
+def day06() -> PhaseTimer:
+
+    timer = PhaseTimer()
 
     # load the character grid and remove the guard symbol
-    grid, location = MutableCharacterGrid.read_character_grid('input06.txt',  '^')
-    assert (location is not None), 'unable to find ^ in character grid'
-    grid[location] = '.'
+    with timer.phase('parse'):
+        source, location = cached_parse('input06.txt', MutableCharacterGrid.read_character_grid, 2, '^')
+        assert (location is not None), 'unable to find ^ in character grid'
+        grid = FlatGrid.from_rows(source.data, chr(OUTSIDE))
+        location = grid.index(*location)
+        grid[location] = '.'
 
     # march on the grid to get part 1 and draw trails
-    part1 = do_march(grid, location)
+    with timer.phase('part1'):
+        part1 = do_march(grid, location)
 
-    print(grid)
+    with timer.phase('render'):
+        print(grid)
 
-    stop: float = time.perf_counter()
+    with timer.phase('part2'):
+        part2 = count_obstructions(grid, location)
 
     print("Advent of Code 2024")
     print("Day 6 - Guard Gallivant")
     print(f"Part 1: {part1}")
-    print("Part 2: TODO")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Part 2: {part2}")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
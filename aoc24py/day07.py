@@ -6,19 +6,24 @@
 # Website:  leechristie.com
 
 
-import time
 from collections.abc import Iterable
 from functools import cache
 
+from inputcache import cached_parse
+from inputs import lines
+from timing import PhaseTimer
+
 
 def problems(filename: str) -> Iterable[tuple[int, list[int]]]:
-    with open(filename) as file:
-        for line in file:
-            line = line.strip()
-            total, numbers = line.split(': ')
-            total = int(total)
-            numbers = [int(n) for n in numbers.split(' ')]
-            yield total, numbers
+    for line in lines(filename):
+        total, numbers = line.split(b': ')
+        total = int(total)
+        numbers = [int(n) for n in numbers.split(b' ')]
+        yield total, numbers
+
+
+def read_problems(filename: str) -> list[tuple[int, list[int]]]:
+    return list(problems(filename))
 
 
 def can_be_true_recursive(target: int, numbers: list[int], first_index: int, cumulative: int) -> bool:
@@ -75,24 +80,28 @@ def can_be_true_with_concat(target: int, numbers: list[int]) -> bool:
     return can_be_true_with_concat_recursive(target, numbers, first_index=1, cumulative=numbers[0])
 
 
-def day07() -> None:
+def day07() -> PhaseTimer:
 
-    start: float = time.perf_counter()
+    timer = PhaseTimer()
 
-    part1 = 0
-    part2 = 0
-    for total, numbers in problems('input07.txt'):
-        if can_be_true(total, numbers):
-            part1 += total
-            part2 += total
-        else:
-            if can_be_true_with_concat(total, numbers):
-                part2 += total
+    with timer.phase('parse'):
+        all_problems: list[tuple[int, list[int]]] = cached_parse('input07.txt', read_problems, 2)
 
-    stop: float = time.perf_counter()
+    with timer.phase('solve'):
+        part1 = 0
+        part2 = 0
+        for total, numbers in all_problems:
+            if can_be_true(total, numbers):
+                part1 += total
+                part2 += total
+            else:
+                if can_be_true_with_concat(total, numbers):
+                    part2 += total
 
     print("Advent of Code 2024")
     print("Day 7 - Bridge Repair")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
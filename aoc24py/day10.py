@@ -6,57 +6,44 @@
 # Website:  leechristie.com
 
 
-import time
 from typing import Optional
-from grid import CharacterGrid
+from grid import CharacterGrid, FlatGrid, distance_field
+from inputcache import cached_parse
+from timing import PhaseTimer
 
 
-def evaluate(grid: CharacterGrid, location: tuple[int, int], ordinal: int) -> tuple[int, set[tuple[int, int]]]:
+def day10() -> PhaseTimer:
 
-    # wrong number
-    here: Optional[str] = grid[location]
-    if here is None or ord(here) != ordinal:
-        return 0, set()
+    timer = PhaseTimer()
 
-    # found goal
-    if ordinal == ord('9'):
-        return 1, {location}
+    with timer.phase('parse'):
+        source = cached_parse('input10.txt', CharacterGrid.read_character_grid, 2)
+        grid = FlatGrid.from_rows(source.data, ' ')
 
-    # check neighbours
-    y, x = location
-    trail_count = 0
-    trail_ends = set()
-    for n in [(y - 1, x), (y, x + 1), (y + 1, x), (y, x - 1)]:
-        score, ends = evaluate(grid, n, ordinal + 1)
-        trail_count += score
-        trail_ends.update(ends)
+    data = grid.data
+    trail_end = ord('9')
 
-    # return all number of trails and reachable trail ends
-    return trail_count, trail_ends
+    # a trail climbs exactly one at each step, the sentinel border never does
+    def climbs(here: int, there: int) -> bool:
+        return data[there] == data[here] + 1
 
-
-def day10() -> None:
-
-    start: float = time.perf_counter()
-
-    part1 = 0
-    part2 = 0
-
-    grid = CharacterGrid.read_character_grid("input10.txt")
-
-    for y in range(grid.height):
-        for x in range(grid.width):
-            location = y, x
-            value = grid[location]
-            if value == '0':
-                count, ends = evaluate(grid, location, ord(value))
-                part1 += len(ends)  # number of reachable ends
-                part2 += count      # count of unique trails
-
-    stop: float = time.perf_counter()
+    with timer.phase('solve'):
+        part1 = 0
+        part2 = 0
+        for trailhead in grid.find_all('0'):
+            # every trail is nine steps long, so every trail is a shortest path to its end
+            field = distance_field(grid, [trailhead], climbs, count_paths=True)
+            paths: Optional[list[int]] = field.paths
+            assert paths is not None
+            for index in field.reached:
+                if data[index] == trail_end:
+                    part1 += 1               # number of reachable ends
+                    part2 += paths[index]    # count of unique trails
 
     print("Advent of Code 2024")
     print("Day 10 - Hoof It")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
@@ -6,15 +6,16 @@
 # Website:  leechristie.com
 
 
-import time
 from functools import cache
 
+from inputcache import cached_parse
+from inputs import lines
+from timing import PhaseTimer
 
-def load_rocks() -> list[int]:
-    with open('input11.txt') as file:
-        for line in file:
-            line = line.strip()
-            return [int(e) for e in line.split()]
+
+def load_rocks(filename: str) -> list[int]:
+    for line in lines(filename):
+        return [int(e) for e in line.split()]
 
 
 @cache
@@ -39,20 +40,27 @@ def num_final_rocks(rock_number: int, blinks: int) -> int:
             return num_final_rocks(rock_number * 2024, blinks - 1)
 
 
-def day11() -> None:
+def day11() -> PhaseTimer:
+
+    timer = PhaseTimer()
 
-    start: float = time.perf_counter()
+    with timer.phase('parse'):
+        rocks: list[int] = cached_parse('input11.txt', load_rocks, 2)
 
-    part1 = 0
-    part2 = 0
-    for rock in load_rocks():
-        part2 += num_final_rocks(rock, 75)
-        part1 += num_final_rocks(rock, 25)
+    with timer.phase('part1'):
+        part1 = 0
+        for rock in rocks:
+            part1 += num_final_rocks(rock, 25)
 
-    stop: float = time.perf_counter()
+    with timer.phase('part2'):
+        part2 = 0
+        for rock in rocks:
+            part2 += num_final_rocks(rock, 75)
 
     print("Advent of Code 2024")
     print("Day 11 - Plutonian Pebbles")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
@@ -6,9 +6,12 @@
 # Website:  leechristie.com
 
 
-import time
 from fractions import Fraction
-from typing import TextIO, Iterable, cast, Optional
+from typing import Iterable, Optional
+
+from inputcache import cached_parse
+from inputs import integer_rows
+from timing import PhaseTimer
 
 
 class AugmentedRow2D:
@@ -36,21 +39,14 @@ class Machine:
         self.prizes = prizes
 
     @staticmethod
-    def parse(lines: list[str]) -> 'Machine':
-        assert len(lines) == 3
-        button_a: tuple[int, int] = cast(tuple[int, int], tuple([int(value.split('+')[1]) for value in lines[0].split(': ')[1].split(', ')]))
-        button_b: tuple[int, int] = cast(tuple[int, int], tuple([int(value.split('+')[1]) for value in lines[1].split(': ')[1].split(', ')]))
-        prizes: tuple[int, int] = cast(tuple[int, int], tuple([int(value.split('=')[1]) for value in lines[2].split(': ')[1].split(', ')]))
-        return Machine(button_a, button_b, prizes)
+    def parse_all(filename: str) -> Iterable['Machine']:
+        # each machine is the six numbers from its button a, button b and prize lines
+        for ax, ay, bx, by, px, py in integer_rows(filename, 6):
+            yield Machine((ax, ay), (bx, by), (px, py))
 
     @staticmethod
-    def parse_all(file: TextIO) -> Iterable['Machine']:
-        try:
-            while True:
-                yield Machine.parse([next(file), next(file), next(file)])
-                assert next(file) == '\n'
-        except StopIteration:
-            return
+    def read_all(filename: str) -> list['Machine']:
+        return list(Machine.parse_all(filename))
 
     def compute_cost(self, error: int=0) -> Optional[int]:
         presses = self.compute_number_of_presses(error=error)
@@ -85,28 +81,31 @@ class Machine:
         return a * 3 + b
 
 
-def day13() -> None:
-
-    start: float = time.perf_counter()
+def day13() -> PhaseTimer:
 
-    part1 = 0
-    part2 = 0
+    timer = PhaseTimer()
 
-    with open('input13.txt') as file:
-        for machine in Machine.parse_all(file):
+    with timer.phase('parse'):
+        machines: list[Machine] = cached_parse('input13.txt', Machine.read_all, 3)
 
+    with timer.phase('part1'):
+        part1 = 0
+        for machine in machines:
             needed = machine.compute_cost()
             if needed is not None:
                 part1 += needed
 
+    with timer.phase('part2'):
+        part2 = 0
+        for machine in machines:
             needed = machine.compute_cost(error=10000000000000)
             if needed is not None:
                 part2 += needed
 
-    stop: float = time.perf_counter()
-
     print("Advent of Code 2024")
     print("Day 13 - Claw Contraption")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
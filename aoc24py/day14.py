@@ -6,11 +6,13 @@
 # Website:  leechristie.com
 
 
-import time
-
 from collections import Counter
 from collections.abc import Generator
 
+from inputcache import cached_parse
+from inputs import integer_rows
+from timing import PhaseTimer
+
 
 class Robot:
 
@@ -20,14 +22,6 @@ class Robot:
         self.dy = dy
         self.dx = dx
 
-    @staticmethod
-    def parse(line: str) -> 'Robot':
-        line = line.strip()
-        position, velocity = line.split(' ')
-        y, x = tuple(reversed([int(e) for e in position.removeprefix('p=').split(',')]))
-        dy, dx = tuple(reversed([int(e) for e in velocity.removeprefix('v=').split(',')]))
-        return Robot(y, x, dy, dx)
-
     @staticmethod
     def print_grid(robots: list['Robot'], height: int, width: int) -> None:
         for y in range(height):
@@ -70,6 +64,13 @@ class Robot:
         return 0
 
 
+def read_robots(filename: str) -> list[Robot]:
+    robots: list[Robot] = []
+    for x, y, dx, dy in integer_rows(filename, 4):
+        robots.append(Robot(y, x, dy, dx))
+    return robots
+
+
 def do_part1_section_counts(robots: list[Robot], height: int, width: int) -> int:
     counter = Counter()
     for y in range(height):
@@ -137,9 +138,9 @@ def first_match_in_periodic_increase(left_sample: list[int], right_sample: list[
     return left
 
 
-def day14() -> None:
+def day14() -> PhaseTimer:
 
-    start: float = time.perf_counter()
+    timer = PhaseTimer()
 
     PART1_STEPS = 100
     PART2_PATTERN_SAMPLE_STEPS = 250
@@ -147,34 +148,32 @@ def day14() -> None:
     HEIGHT = 103
     WIDTH = 101
 
-    robots: list[Robot] = []
-    with open('../input/input14.txt') as file:
-        for line in file:
-            robots.append(Robot.parse(line))
-
-    part1 = 0
-
-    y_variance, x_variance = find_variance(robots)
-    y_variances = [y_variance]
-    x_variances = [x_variance]
-    for step in range(1, PART2_PATTERN_SAMPLE_STEPS + 1):
-        for robot in robots:
-            robot.step(HEIGHT, WIDTH)
-        y_variance, x_variance = find_variance(robots)
-        y_variances.append(y_variance)
-        x_variances.append(x_variance)
-        if step == PART1_STEPS:
-            part1 = do_part1_section_counts(robots, HEIGHT, WIDTH)
-
-    y_sequence, x_sequence = variances_to_outlier_sequences(y_variances, x_variances)
-    part2 = first_match_in_periodic_increase(y_sequence, x_sequence)
+    with timer.phase('parse'):
+        robots: list[Robot] = cached_parse('input14.txt', read_robots, 3)
 
-    stop: float = time.perf_counter()
+    # simulate the robots, counting the quadrants for part 1 on the way
+    with timer.phase('simulate'):
+        part1 = 0
+        y_variance, x_variance = find_variance(robots)
+        y_variances = [y_variance]
+        x_variances = [x_variance]
+        for step in range(1, PART2_PATTERN_SAMPLE_STEPS + 1):
+            for robot in robots:
+                robot.step(HEIGHT, WIDTH)
+            y_variance, x_variance = find_variance(robots)
+            y_variances.append(y_variance)
+            x_variances.append(x_variance)
+            if step == PART1_STEPS:
+                part1 = do_part1_section_counts(robots, HEIGHT, WIDTH)
+
+    with timer.phase('part2'):
+        y_sequence, x_sequence = variances_to_outlier_sequences(y_variances, x_variances)
+        part2 = first_match_in_periodic_increase(y_sequence, x_sequence)
 
     print("Advent of Code 2024")
     print("Day 14 - Restroom Redoubt")
     print(f"Part 1: {part1}")
-    assert 229868730 == part1
     print(f"Part 2: {part2}")
-    assert 7861 == part2
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
@@ -6,11 +6,11 @@
 # Website:  leechristie.com
 
 
-import time
 from collections.abc import Generator
-from typing import Optional
 
-from grid import MutableCharacterGrid
+from grid import FlatGrid, MutableCharacterGrid
+from inputcache import cached_parse
+from timing import PhaseTimer
 
 
 def direction_arrows(directions_string: str) -> Generator[[None], tuple[int, int]]:
@@ -25,148 +25,121 @@ def direction_arrows(directions_string: str) -> Generator[[None], tuple[int, int
             yield 0, -1
 
 
-def buddy(grid: MutableCharacterGrid, y: int, x: int) -> tuple[int, int]:
-    assert grid[(y, x)] == '[' or grid[(y, x)] == ']'
-    if grid[(y, x)] == '[':
-        return y, x + 1
-    return y, x - 1
+FLOOR, WALL, BOX, BOX_LEFT, BOX_RIGHT = ord('.'), ord('#'), ord('O'), ord('['), ord(']')
 
 
-def move(grid: MutableCharacterGrid, y: int, x: int, dy: int, dx: int, buddy_push:bool=False) -> None:
-    character: Optional[str] = grid[(y, x)]
-    assert character is not None
-    assert character != '#'
-    if character == '.':
-        return
-    if dx == 1:  # right (east)
-        assert dy == 0
-        assert (character == '[' or character == ']'), f'tried to push {character}'
-        move(grid, y, x + 1, dy, dx)
-        assert grid[(y + dy, x + dx)] == '.'
-        grid[(y + dy, x + dx)] = character
-        grid[(y, x)] = '.'
-        #print(f'actually moved a {character} right')
-        return
-    if dx == -1:  # left (west)
-        assert dy == 0
-        assert (character == '[' or character == ']'), f'tried to push {character}'
-        move(grid, y, x - 1, dy, dx)
-        assert grid[(y + dy, x + dx)] == '.'
-        grid[(y + dy, x + dx)] = character
-        grid[(y, x)] = '.'
-        #print(f'actually moved a {character} left')
-        return
-    if dy == 1:  # down (south)
-        assert dx == 0
-        assert (character == '[' or character == ']'), f'tried to push {character}'
-        move(grid, y + 1, x, dy, dx)
-        if not buddy_push:  # not already moving as a result of a buddy push
-            buddy_y, buddy_x = buddy(grid, y, x)
-            move(grid, buddy_y, buddy_x, dy, dx, buddy_push=True)
-        grid[(y + dy, x + dx)] = character
-        grid[(y, x)] = '.'
-        return
-    if dy == -1:  # up (north)
-        assert dx == 0
-        assert (character == '[' or character == ']'), f'tried to push {character}'
-        move(grid, y - 1, x, dy, dx)
-        if not buddy_push:  # not already moving as a result of a buddy push
-            buddy_y, buddy_x = buddy(grid, y, x)
-            move(grid, buddy_y, buddy_x, dy, dx, buddy_push=True)
-        grid[(y + dy, x + dx)] = character
-        grid[(y, x)] = '.'
+def push(grid: FlatGrid, location: int, offset: int) -> bool:
+    data = grid.data
+    assert data[location] != BOX and data[location] != WALL
+    end = location + offset
+    while data[end] == BOX:
+        end += offset
+    if data[end] == WALL:
+        return False
+    if end != location + offset:
+        data[end] = BOX
+        data[location + offset] = FLOOR
+    return True
+
+
+def buddy(grid: FlatGrid, location: int) -> int:
+    assert grid.data[location] == BOX_LEFT or grid.data[location] == BOX_RIGHT
+    if grid.data[location] == BOX_LEFT:
+        return location + 1
+    return location - 1
+
+
+def move(grid: FlatGrid, location: int, offset: int, buddy_push: bool=False) -> None:
+    data = grid.data
+    character: int = data[location]
+    assert character != WALL
+    if character == FLOOR:
         return
-    assert False, 'unknown option in push'
-
-
-def stops_movement(grid: MutableCharacterGrid, y: int, x: int, dy: int, dx: int, buddy_push=False) -> bool:
-    character: Optional[str] = grid[(y, x)]
-    if character == '[':
-        assert (grid[(y, x + 1)] == ']'), "[ lost it's ]"
-    if character == ']':
-        assert (grid[(y, x - 1)] == '['), "] lost it's ["
-    #print(f'checking if can push {character} at {y, x} in direction {dy, dx} ({recursive=}) ...')
-    assert character is not None
-    if character == '#':
+    assert (character == BOX_LEFT or character == BOX_RIGHT), f'tried to push {chr(character)}'
+    move(grid, location + offset, offset)
+    if offset == 1 or offset == -1:  # right (east) or left (west)
+        assert data[location + offset] == FLOOR
+    elif not buddy_push:  # up or down, and not already moving as a result of a buddy push
+        move(grid, buddy(grid, location), offset, buddy_push=True)
+    data[location + offset] = character
+    data[location] = FLOOR
+
+
+def stops_movement(grid: FlatGrid, location: int, offset: int, buddy_push: bool=False) -> bool:
+    data = grid.data
+    character: int = data[location]
+    if character == BOX_LEFT:
+        assert (data[location + 1] == BOX_RIGHT), "[ lost it's ]"
+    if character == BOX_RIGHT:
+        assert (data[location - 1] == BOX_LEFT), "] lost it's ["
+    if character == WALL:
         return True
-    if character == '.':
+    if character == FLOOR:
         return False
-    if dx == 1:  # right (east)
-        assert dy == 0
-        assert (character == '[' or character == ']'), f'tried to think about pushing {character}'
-        return stops_movement(grid, y, x + 1, dy, dx)
-    elif dx == -1:  # left (west)
-        assert dy == 0
-        assert (character == '[' or character == ']'), f'tried to think about pushing {character}'
-        return stops_movement(grid, y, x - 1, dy, dx)
-    elif dy == 1:  # down (south)
-        assert dx == 0
-        assert (character == '[' or character == ']'), f'tried to think about pushing {character}'
-        if not buddy_push:  # not already moving as a result of a buddy push
-            buddy_y, buddy_x = buddy(grid, y, x)
-            if stops_movement(grid, buddy_y, buddy_x, dy, dx, buddy_push=True):
-                return True
-        return stops_movement(grid, y + 1, x, dy, dx)
-    elif dy == -1:  # down (north)
-        assert dx == 0
-        assert (character == '[' or character == ']'), f'tried to think about pushing {character}'
-        if not buddy_push:  # not already moving as a result of a buddy push
-            buddy_y, buddy_x = buddy(grid, y, x)
-            if stops_movement(grid, buddy_y, buddy_x, dy, dx, buddy_push=True):
-                return True
-        return stops_movement(grid, y - 1, x, dy, dx)
-    return False
-
-
-def day15() -> None:
-
-    start: float = time.perf_counter()
+    assert (character == BOX_LEFT or character == BOX_RIGHT), f'tried to think about pushing {chr(character)}'
+    if offset != 1 and offset != -1 and not buddy_push:  # up or down, and not already moving as a result of a buddy push
+        if stops_movement(grid, buddy(grid, location), offset, buddy_push=True):
+            return True
+    return stops_movement(grid, location + offset, offset)
+
+
+def gps_sum(grid: FlatGrid, character: int) -> int:
+    rv = 0
+    for location in grid.cells():
+        if grid.data[location] == character:
+            y, x = grid.location(location)
+            rv += y * 100 + x
+    return rv
+
+
+def day15() -> PhaseTimer:
+
+    timer = PhaseTimer()
 
     ##########
     # Part 1 #
     ##########
 
-    grid, (y, x), footer = MutableCharacterGrid.read_character_grid_with_footer('input15.txt', '@')
-    grid[(y, x)] = '.'
+    with timer.phase('parse'):
+        source, (y, x), footer = cached_parse('input15.txt', MutableCharacterGrid.read_character_grid_with_footer, 2, '@')
+        grid = FlatGrid.from_rows(source.data, '#')
+        location = grid.index(y, x)
+        grid[location] = '.'
 
-    for dy, dx in direction_arrows(footer):
-        if grid.push(y, x, dy, dx, 'O', '#'):
-            y += dy
-            x += dx
+    with timer.phase('part1'):
 
-    part1 = 0
-    for y in range(grid.height):
-        for x in range(grid.width):
-            good_position = y * 100 + x
-            if grid[(y, x)] == 'O':
-                part1 += good_position
+        for stride in direction_arrows(footer):
+            offset = grid.offset(stride)
+            if push(grid, location, offset):
+                location += offset
+
+        part1 = gps_sum(grid, BOX)
 
     ##########
     # Part 2 #
     ##########
 
-    translation = {'#': '##', 'O': '[]', '.': '..', '@': '@.'}
-    grid, (y, x), footer = MutableCharacterGrid.read_character_grid_with_footer('input15.txt', '@', translation)
-    loc = y, x
-    grid[loc] = '.'
+    with timer.phase('parse wide'):
+        translation = {'#': '##', 'O': '[]', '.': '..', '@': '@.'}
+        source, (y, x), footer = cached_parse('input15.txt', MutableCharacterGrid.read_character_grid_with_footer, 2, '@', translation)
+        grid = FlatGrid.from_rows(source.data, '#')
+        location = grid.index(y, x)
+        grid[location] = '.'
 
-    for dy, dx in direction_arrows(footer):
-        if not stops_movement(grid, y + dy, x + dx, dy, dx):
-            move(grid, y + dy, x + dx, dy, dx)
-            y += dy
-            x += dx
+    with timer.phase('part2'):
 
-    part2 = 0
-    for y in range(grid.height):
-        for x in range(grid.width):
-            good_position = y * 100 + x
-            if grid[(y, x)] == '[':
-                part2 += good_position
+        for stride in direction_arrows(footer):
+            offset = grid.offset(stride)
+            if not stops_movement(grid, location + offset, offset):
+                move(grid, location + offset, offset)
+                location += offset
 
-    stop: float = time.perf_counter()
+        part2 = gps_sum(grid, BOX_LEFT)
 
     print("Advent of Code 2024")
     print("Day 15 - Warehouse Woes")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
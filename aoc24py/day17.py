@@ -6,11 +6,14 @@
 # Website:  leechristie.com
 
 import itertools
-import time
-from typing import TextIO, Optional
+from typing import Iterator, Optional
 from enum import Enum
 import tqdm.auto as tqdm
 
+from inputcache import cached_parse
+from inputs import lines
+from timing import PhaseTimer
+
 
 class Machine:
 
@@ -188,54 +191,55 @@ class OpCode(Enum):
         return OpCode.CDV
 
 
-def read_register(file: TextIO, register_id: str) -> int:
-    line: str = next(file)
-    prefix: str = f'Register {register_id}: '
+def read_register(file: Iterator[bytes], register_id: str) -> int:
+    line: bytes = next(file)
+    prefix: bytes = f'Register {register_id}: '.encode()
     assert line.startswith(prefix)
     line = line.removeprefix(prefix)
     return int(line)
 
 
-def read_program(file: TextIO) -> tuple[int, ...]:
-    line: str = next(file)
-    prefix: str = 'Program: '
+def read_program(file: Iterator[bytes]) -> tuple[int, ...]:
+    line: bytes = next(file)
+    prefix: bytes = b'Program: '
     assert line.startswith(prefix)
     line = line.removeprefix(prefix)
-    numbers: tuple[int, ...] = tuple(int(number) for number in line.split(','))
+    numbers: tuple[int, ...] = tuple(int(number) for number in line.split(b','))
     return numbers
 
 
 def read_input(filename: str) -> Machine:
-    with open(filename) as file:
-        register_a = read_register(file, 'A')
-        register_b = read_register(file, 'B')
-        register_c = read_register(file, 'C')
-        assert not next(file).strip()
-        program = read_program(file)
-        for line in file:
-            line = line.strip()
-            print(line)
-        return Machine(register_a, register_b, register_c, program)
+    file = lines(filename)
+    register_a = read_register(file, 'A')
+    register_b = read_register(file, 'B')
+    register_c = read_register(file, 'C')
+    assert not next(file).strip()
+    program = read_program(file)
+    for line in file:
+        line = line.strip()
+        print(line.decode())
+    return Machine(register_a, register_b, register_c, program)
 
-def day17() -> None:
+def day17() -> PhaseTimer:
 
-    start: float = time.perf_counter()
+    timer = PhaseTimer()
 
-    # machine: Machine = read_input('small17.txt')
-    # machine: Machine = read_input('example17.txt')
-    machine: Machine = read_input('input17.txt')
+    with timer.phase('parse'):
+        # machine: Machine = read_input('small17.txt')
+        # machine: Machine = read_input('example17.txt')
+        machine: Machine = cached_parse('input17.txt', read_input, 2)
 
-    part1: str = machine.run()
-    part2: int = machine.mine()
+    with timer.phase('part1'):
+        part1: str = machine.run()
 
-    stop: float = time.perf_counter()
+    with timer.phase('part2'):
+        part2: int = machine.mine()
 
     print("Advent of Code 2024")
     print("Day 17 - Chronospatial Computer")
     print(f"Part 1: {part1}")
-    assert part1 in ('5,7,3,0', '4,6,3,5,6,3,5,2,1,0', '4,6,1,4,2,1,3,1,6')
     print(f"Part 2: {part2}")
-    if part1 == '5,7,3,0':
-        assert part2 == 117440
     # 118,393,894,510 is too low!
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
@@ -6,28 +6,28 @@
 # Website:  leechristie.com
 
 
-import time
-from typing import Generator
+from typing import Generator, Optional
 
-from astar import *
-from grid import MutableCharacterGrid
+from grid import BitGrid, FlatGrid, distance_field
+from inputcache import cached_parse
+from inputs import integer_rows
+from timing import PhaseTimer
 from twodee import *
 
 def read_input(filename: str, limit: Optional[int]=None) -> Generator[Point]:
     assert limit is None or (type(limit) == int and limit > 0)
     count = 0
-    with open(filename) as file:
-        for line in file:
-            line = line.strip()
-            x, y = line.split(',')
-            x = int(x)
-            y = int(y)
-            assert 0 <= x <= 70
-            assert 0 <= y <= 70
-            yield Point(y, x)
-            count += 1
-            if limit is not None and count >= limit:
-                break
+    for x, y in integer_rows(filename, 2):
+        assert 0 <= x <= 70
+        assert 0 <= y <= 70
+        yield Point(y, x)
+        count += 1
+        if limit is not None and count >= limit:
+            break
+
+def read_bytes(filename: str) -> list[Point]:
+    return list(read_input(filename))
+
 
 HEIGHT = 71
 WIDTH = 71
@@ -35,66 +35,65 @@ FILENAME = 'input18.txt'
 LIMIT = 1024
 
 
-def neighbours_on(grid: MutableCharacterGrid) -> Callable[[Point], list[tuple[Point, int]]]:
-    def neighbours(p: Point) -> list[tuple[Point, int]]:
-        rv: list[tuple[Point, int]] = []
-        y = p.y
-        x = p.x
-        for neighbour in ((y - 1, x), (y, x + 1), (y + 1, x), (y, x - 1)):
-            if grid[neighbour] == '.':
-                rv.append((Point(neighbour[0], neighbour[1]), 1))
-        return rv
-    return neighbours
+# whether the first count bytes to fall cut the top left corner off from the bottom right, flooding the free cells
+# from the corner as a bitboard
+def cut_off(all_failed_bytes: list[Point], count: int) -> bool:
+    fallen = BitGrid(HEIGHT, WIDTH)
+    for point in all_failed_bytes[:count]:
+        fallen.add((point.y, point.x))
+    start = fallen.like(fallen.bit((0, 0)))
+    reached, _ = (~fallen).flood(start, target=(HEIGHT - 1, WIDTH - 1))
+    return (HEIGHT - 1, WIDTH - 1) not in reached
 
 
-def day18() -> None:
+def day18() -> PhaseTimer:
 
-    start: float = time.perf_counter()
+    timer = PhaseTimer()
 
-    end_point: Point = Point(HEIGHT - 1, WIDTH - 1)
+    with timer.phase('parse'):
 
-    grid = MutableCharacterGrid.blank(HEIGHT, WIDTH, '.')
+        all_failed_bytes: list[Point] = cached_parse(FILENAME, read_bytes, 3)
 
-    for point in read_input(FILENAME, limit=LIMIT):
-        grid[(point.y, point.x)] = '#'
+        grid = FlatGrid(HEIGHT, WIDTH, '.', '#')
 
-    start_point: Point = Point(0, 0)  # T
-    goal: Callable[[Point], bool] = lambda p: p == end_point
-    heuristic: Callable[[Point], int] = lambda p: end_point.distance(p)
+        for point in all_failed_bytes[:LIMIT]:
+            grid[grid.index(point.y, point.x)] = '#'
 
-    path = a_star(start_point, goal, heuristic, neighbours_on(grid))
-    part1: int = len(path) - 1
+    end_point: int = grid.index(HEIGHT - 1, WIDTH - 1)
+    start_point: int = grid.index(0, 0)
 
-    all_failed_bytes = list(read_input(FILENAME))
+    with timer.phase('part1'):
+        # every step costs one, so a breadth first search finds the shortest path without a heap or a heuristic
+        field = distance_field(grid, [start_point], '.', goal=end_point)
+        part1: Optional[int] = field.distance(end_point)
 
-    for index, failed_byte in enumerate(all_failed_bytes):
-        if index < LIMIT:
-            assert grid[(failed_byte.y, failed_byte.x)] == '#'
-        else:
-            assert grid[(failed_byte.y, failed_byte.x)] == '.'
-            break
+    with timer.phase('part2'):
 
-    critical_tiles: set[Point] = set(path)
-
-    part2: str = ''
-    for index, failed_byte in enumerate(all_failed_bytes[LIMIT:], start=LIMIT):
-        grid[(failed_byte.y, failed_byte.x)] = '#'
-        if failed_byte not in critical_tiles:
-            # rerouting is not needed
-            continue
-        path: Optional[list[Point]] = a_star(start_point, goal, heuristic, neighbours_on(grid))
-        if path is None:
-            # rerouting is impossible
-            part2 = f'{failed_byte.x},{failed_byte.y}'
-            break
-        else:
-            # apply reroute
-            critical_tiles = set(path)
+        for index, failed_byte in enumerate(all_failed_bytes):
+            if index < LIMIT:
+                assert grid[grid.index(failed_byte.y, failed_byte.x)] == '#'
+            else:
+                assert grid[grid.index(failed_byte.y, failed_byte.x)] == '.'
+                break
 
-    stop: float = time.perf_counter()
+        # binary search for the number of bytes that first cuts off the exit, the exit is reachable after low bytes,
+        # which is LIMIT if part 1 found a path, and otherwise no bytes at all
+        part2: str = ''
+        low, high = (LIMIT if part1 is not None else 0), len(all_failed_bytes)
+        if cut_off(all_failed_bytes, high):
+            while high - low > 1:
+                middle = (low + high) // 2
+                if cut_off(all_failed_bytes, middle):
+                    high = middle
+                else:
+                    low = middle
+            failed_byte = all_failed_bytes[high - 1]
+            part2 = f'{failed_byte.x},{failed_byte.y}'
 
     print("Advent of Code 2024")
     print("Day 18 - RAM Run")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
@@ -5,19 +5,22 @@
 # Mastodon: @0x1ac@techhub.social
 # Website:  leechristie.com
 import re
-import time
 from functools import cache
 from itertools import count
 
+from inputcache import cached_parse
+from inputs import lines
+from timing import PhaseTimer
+
 
 def read_input(filename: str) -> tuple[list[str], list[str]]:
     targets: list[str] = []
-    with open(filename) as file:
-        materials = next(file).strip().split(', ')
-        assert next(file).strip() == ''
-        for target in file:
-            target = target.strip()
-            targets.append(target)
+    file = lines(filename)
+    materials = next(file).strip().decode().split(', ')
+    assert next(file).strip() == b''
+    for target in file:
+        target = target.strip()
+        targets.append(target.decode())
     return materials, targets
 
 
@@ -70,29 +73,31 @@ def ways_of_matching(encoded_target: list[int], encoded_materials: list[list[int
     return ways_of_tail_matching(0)
 
 
-def day19() -> None:
-
-    start: float = time.perf_counter()
+def day19() -> PhaseTimer:
 
-    materials, targets = read_input('input19.txt')
+    timer = PhaseTimer()
 
-    symbols = {s: i for s, i in zip(sorted(symbol_set(materials)), count())}
+    with timer.phase('parse'):
+        materials, targets = cached_parse('input19.txt', read_input, 2)
 
-    encoded_materials: list[list[int]] = [encode(material, symbols) for material in materials]
+    with timer.phase('encode'):
+        symbols = {s: i for s, i in zip(sorted(symbol_set(materials)), count())}
+        encoded_materials: list[list[int]] = [encode(material, symbols) for material in materials]
+        encoded_targets: list[list[int]] = [encode(target, symbols) for target in targets]
 
-    part1: int = 0
-    part2: int = 0
-    for target in targets:
-        encoded_target: list[int] = encode(target, symbols)
-        number_of_ways = ways_of_matching(encoded_target, encoded_materials)
-        if number_of_ways:
-            part1 += 1
-        part2 += number_of_ways
-
-    stop: float = time.perf_counter()
+    with timer.phase('solve'):
+        part1: int = 0
+        part2: int = 0
+        for encoded_target in encoded_targets:
+            number_of_ways = ways_of_matching(encoded_target, encoded_materials)
+            if number_of_ways:
+                part1 += 1
+            part2 += number_of_ways
 
     print("Advent of Code 2024")
     print("Day 19 - Linen Layout")
     print(f"Part 1: {part1}")
     print(f"Part 2: {part2}")
-    print(f"Time Taken: {stop-start:.6f} s")
+    print(f"Time Taken: {timer.total():.6f} s")
+
+    return timer
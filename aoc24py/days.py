@@ -0,0 +1,66 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import importlib
+import time
+from typing import Callable
+
+from timing import PhaseTimer
+
+
+# day number to the module (and function) implementing it, modules are only imported when a day is requested
+DAYS: dict[int, str] = {
+    1: 'day01',
+    2: 'day02',
+    3: 'day03',
+    4: 'day04',
+    5: 'day05',
+    6: 'day06',
+    7: 'day07',
+    10: 'day10',
+    11: 'day11',
+    12: 'day12',
+    13: 'day13',
+    14: 'day14',
+    15: 'day15',
+    16: 'day16',
+    17: 'day17',
+    18: 'day18',
+    19: 'day19',
+}
+
+
+def parse_days(spec: str) -> list[int]:
+    if spec == 'all':
+        return sorted(DAYS)
+    rv: list[int] = []
+    for item in spec.split(','):
+        if '-' in item:
+            first, last = item.split('-')
+            rv.extend(day for day in range(int(first), int(last) + 1) if day in DAYS)
+        else:
+            day = int(item)
+            if day not in DAYS:
+                raise ValueError(f'invalid day {day}')
+            rv.append(day)
+    return sorted(set(rv))
+
+
+def load_day(day: int) -> Callable[[], PhaseTimer]:
+    if day not in DAYS:
+        raise ValueError(f'invalid day {day}')
+    name: str = DAYS[day]
+    module = importlib.import_module(name)
+    return getattr(module, name)
+
+
+def load_day_timed(day: int) -> tuple[Callable[[], PhaseTimer], float]:
+    start: float = time.perf_counter()
+    function = load_day(day)
+    stop: float = time.perf_counter()
+    return function, stop - start
@@ -0,0 +1,392 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import argparse
+import random
+import string
+import sys
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable
+
+
+def day01(rng: random.Random, lines: int) -> str:
+    left = [rng.randrange(10000, 100000) for _ in range(lines)]
+    # about half of the right list repeats values from the left list so that part 2 has similarity to score
+    right = [rng.choice(left) if rng.random() < 0.5 else rng.randrange(10000, 100000) for _ in range(lines)]
+    return ''.join(f'{l}   {r}\n' for l, r in zip(left, right))
+
+
+def day02(rng: random.Random, reports: int, length: int) -> str:
+    rv: list[str] = []
+    for _ in range(reports):
+        direction = rng.choice((-1, 1))
+        levels = [rng.randrange(10, 90)]
+        for _ in range(length - 1):
+            levels.append(levels[-1] + direction * rng.randint(1, 3))
+        # break about half of the reports, some in more than one place
+        while rng.random() < 0.5:
+            levels[rng.randrange(length)] += rng.choice((-4, -1, 0, 1, 4))
+        rv.append(' '.join(str(level) for level in levels))
+    return '\n'.join(rv) + '\n'
+
+
+def day03(rng: random.Random, instructions: int) -> str:
+    junk = ['mul(4*', 'mul ( 2 , 4 )', 'mul[3,7]', '?(12,34)', 'do_not_mul(5,5)', 'don\'t', 'what()', 'from()',
+            '+mul(32,64]', 'select()', '#', '%&', '@', ' ', '$', '>', '<', ')', '(', ',', ']', '[', 'how()']
+    rv = ''
+    for i in range(instructions):
+        roll = rng.random()
+        if roll < 0.05:
+            rv += 'do()'
+        elif roll < 0.1:
+            rv += "don't()"
+        else:
+            rv += f'mul({rng.randint(1, 999)},{rng.randint(1, 999)})'
+        rv += ''.join(rng.choice(junk) for _ in range(rng.randint(0, 4)))
+        if i % 60 == 59:
+            rv += '\n'
+    return rv + '\n'
+
+
+def day04(rng: random.Random, size: int) -> str:
+    return ''.join(''.join(rng.choice('XMAS') for _ in range(size)) + '\n' for _ in range(size))
+
+
+def day05(rng: random.Random, pages: int, updates: int) -> str:
+    numbers = rng.sample(range(10, 10 + 2 * pages), pages)
+    # every pair of pages gets a rule, following one hidden total order
+    rules = [(numbers[i], numbers[j]) for i in range(pages) for j in range(i + 1, pages)]
+    rng.shuffle(rules)
+    rv = ''.join(f'{a}|{b}\n' for a, b in rules) + '\n'
+    for _ in range(updates):
+        length = rng.randrange(5, min(pages, 23) + 1, 2) if pages >= 5 else 1
+        update = rng.sample(numbers, length)
+        if rng.random() < 0.5:
+            update.sort(key=numbers.index)
+        rv += ','.join(str(page) for page in update) + '\n'
+    return rv
+
+
+def guard_escapes(grid: list[list[str]], y: int, x: int) -> bool:
+    height, width = len(grid), len(grid[0])
+    dy, dx = -1, 0
+    seen: set[tuple[int, int, int, int]] = set()
+    while 0 <= y < height and 0 <= x < width:
+        if (y, x, dy, dx) in seen:
+            return False
+        seen.add((y, x, dy, dx))
+        ny, nx = y + dy, x + dx
+        if 0 <= ny < height and 0 <= nx < width and grid[ny][nx] == '#':
+            dy, dx = dx, -dy
+        else:
+            y, x = ny, nx
+    return True
+
+
+def day06(rng: random.Random, size: int, density: int) -> str:
+    # keep trying until the guard walks off the map, as day 6 would loop forever otherwise
+    while True:
+        grid = [['#' if rng.random() * 1000 < density else '.' for _ in range(size)] for _ in range(size)]
+        y, x = rng.randrange(size), rng.randrange(size)
+        grid[y][x] = '.'
+        if guard_escapes(grid, y, x):
+            grid[y][x] = '^'
+            return ''.join(''.join(row) + '\n' for row in grid)
+
+
+def day07(rng: random.Random, equations: int, numbers: int) -> str:
+    rv: list[str] = []
+    for _ in range(equations):
+        values = [rng.randint(1, 9) if rng.random() < 0.7 else rng.randint(10, 999) for _ in range(rng.randint(2, numbers))]
+        total = values[0]
+        for value in values[1:]:
+            operator = rng.random()
+            if operator < 0.4:
+                total += value
+            elif operator < 0.8:
+                total *= value
+            else:
+                total = int(f'{total}{value}')
+        if rng.random() < 0.3:
+            total += rng.randint(1, 9)
+        rv.append(f'{total}: ' + ' '.join(str(value) for value in values))
+    return '\n'.join(rv) + '\n'
+
+
+def day10(rng: random.Random, size: int) -> str:
+    # a landscape of peaks, each sloping away one height per step, with some cells scrambled
+    peaks = [(rng.randrange(size), rng.randrange(size)) for _ in range(max(1, size * size // 60))]
+    height = [[0] * size for _ in range(size)]
+    frontier: deque[tuple[int, int]] = deque()
+    distance = [[-1] * size for _ in range(size)]
+    for y, x in peaks:
+        distance[y][x] = 0
+        frontier.append((y, x))
+    while frontier:
+        y, x = frontier.popleft()
+        for ny, nx in ((y - 1, x), (y, x + 1), (y + 1, x), (y, x - 1)):
+            if 0 <= ny < size and 0 <= nx < size and distance[ny][nx] < 0:
+                distance[ny][nx] = distance[y][x] + 1
+                frontier.append((ny, nx))
+    for y in range(size):
+        for x in range(size):
+            height[y][x] = max(0, 9 - distance[y][x]) if rng.random() > 0.05 else rng.randint(0, 9)
+    return ''.join(''.join(str(h) for h in row) + '\n' for row in height)
+
+
+def day11(rng: random.Random, stones: int) -> str:
+    return ' '.join(str(rng.choice((0, rng.randrange(10), rng.randrange(10 ** 7)))) for _ in range(stones)) + '\n'
+
+
+def day12(rng: random.Random, size: int) -> str:
+    # grow plots outwards from random seeds in breadth first order, then sprinkle single cell plots on top
+    grid = [[''] * size for _ in range(size)]
+    frontier: deque[tuple[int, int]] = deque()
+    for _ in range(max(1, size * size // 150)):
+        y, x = rng.randrange(size), rng.randrange(size)
+        if not grid[y][x]:
+            grid[y][x] = rng.choice(string.ascii_uppercase)
+            frontier.append((y, x))
+    while frontier:
+        y, x = frontier.popleft()
+        neighbours = [(y - 1, x), (y, x + 1), (y + 1, x), (y, x - 1)]
+        rng.shuffle(neighbours)
+        for ny, nx in neighbours:
+            if 0 <= ny < size and 0 <= nx < size and not grid[ny][nx]:
+                grid[ny][nx] = grid[y][x]
+                frontier.append((ny, nx))
+    for y in range(size):
+        for x in range(size):
+            if rng.random() < 0.01:
+                grid[y][x] = rng.choice(string.ascii_uppercase)
+    return ''.join(''.join(row) + '\n' for row in grid)
+
+
+def day13(rng: random.Random, machines: int) -> str:
+    rv: list[str] = []
+    for _ in range(machines):
+        while True:
+            ax, ay, bx, by = (rng.randint(10, 99) for _ in range(4))
+            if ax * by - ay * bx != 0:
+                break
+        if rng.random() < 0.5:
+            a, b = rng.randint(0, 100), rng.randint(1, 100)
+            px, py = a * ax + b * bx, a * ay + b * by
+        else:
+            px, py = rng.randint(1000, 20000), rng.randint(1000, 20000)
+        rv.append(f'Button A: X+{ax}, Y+{ay}\nButton B: X+{bx}, Y+{by}\nPrize: X={px}, Y={py}\n')
+    return '\n'.join(rv)
+
+
+def day14(rng: random.Random, robots: int) -> str:
+    # day 14 works on a fixed 103 by 101 room, and looks for the step where the robots bunch up, so most robots are
+    # placed to meet in a small square near the middle at a hidden step early enough to be seen twice in each axis
+    height, width = 103, 101
+    meet = rng.randint(1, 140)
+    size = 21
+    top = (height - size) // 2 + rng.randint(-10, 10)
+    left = (width - size) // 2 + rng.randint(-10, 10)
+    rv: list[str] = []
+    for i in range(robots):
+        dy, dx = rng.randint(-99, 99), rng.randint(-99, 99)
+        if i < robots * 7 // 10:
+            y = (top + rng.randrange(size) - dy * meet) % height
+            x = (left + rng.randrange(size) - dx * meet) % width
+        else:
+            y, x = rng.randrange(height), rng.randrange(width)
+        rv.append(f'p={x},{y} v={dx},{dy}')
+    return '\n'.join(rv) + '\n'
+
+
+def day15(rng: random.Random, size: int, moves: int) -> str:
+    grid = [['#' if y in (0, size - 1) or x in (0, size - 1) else
+             '#' if rng.random() < 0.05 else 'O' if rng.random() < 0.25 else '.'
+             for x in range(size)] for y in range(size)]
+    y, x = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+    grid[y][x] = '@'
+    arrows = ''.join(rng.choice('^>v<') for _ in range(moves))
+    rv = ''.join(''.join(row) + '\n' for row in grid) + '\n'
+    rv += ''.join(arrows[i:i + 1000] + '\n' for i in range(0, moves, 1000))
+    return rv
+
+
+def day16(rng: random.Random, size: int, loops: int) -> str:
+    # a perfect maze carved by an iterative depth first search, with some walls knocked through to make loops, size is
+    # rounded up to be odd so the cells and walls alternate
+    size += 1 - size % 2
+    grid = [['#'] * size for _ in range(size)]
+    start = (size - 2, 1)
+    grid[start[0]][start[1]] = '.'
+    stack = [start]
+    while stack:
+        y, x = stack[-1]
+        options = [(y + dy, x + dx, dy, dx) for dy, dx in ((-2, 0), (0, 2), (2, 0), (0, -2))
+                   if 0 < y + dy < size - 1 and 0 < x + dx < size - 1 and grid[y + dy][x + dx] == '#']
+        if not options:
+            stack.pop()
+            continue
+        ny, nx, dy, dx = rng.choice(options)
+        grid[y + dy // 2][x + dx // 2] = '.'
+        grid[ny][nx] = '.'
+        stack.append((ny, nx))
+    for _ in range(size * size * loops // 1000):
+        y, x = rng.randrange(1, size - 1), rng.randrange(1, size - 1)
+        if (y % 2 == 1) != (x % 2 == 1):
+            grid[y][x] = '.'
+    grid[size - 2][1] = 'S'
+    grid[1][size - 2] = 'E'
+    return ''.join(''.join(row) + '\n' for row in grid)
+
+
+def day17(rng: random.Random, length: int) -> str:
+    # a loop that mixes the low bits of A into B and C, outputs a value, shifts A by three bits and jumps back while A
+    # is not zero, the middle of the loop gets longer with the length parameter
+    body: list[int] = [2, 4, 1, rng.randrange(8), 7, 5]
+    for _ in range(length):
+        body += rng.choice(([1, rng.randrange(8)], [4, rng.randrange(8)], [7, 5], [2, 5], [2, 6]))
+    body += [5, 5, 0, 3, 3, 0]
+    register_a = rng.getrandbits(3 * len(body)) | 1 << (3 * len(body) - 1)
+    return f'Register A: {register_a}\nRegister B: 0\nRegister C: 0\n\nProgram: {",".join(str(v) for v in body)}\n'
+
+
+def corner_to_corner(blocked: set[tuple[int, int]], size: int) -> bool:
+    seen = {(0, 0)}
+    frontier: deque[tuple[int, int]] = deque([(0, 0)])
+    while frontier:
+        x, y = frontier.popleft()
+        if (x, y) == (size - 1, size - 1):
+            return True
+        for n in ((x - 1, y), (x, y + 1), (x + 1, y), (x, y - 1)):
+            if 0 <= n[0] < size and 0 <= n[1] < size and n not in seen and n not in blocked:
+                seen.add(n)
+                frontier.append(n)
+    return False
+
+
+def day18(rng: random.Random, falling: int) -> str:
+    # day 18 works on a fixed 71 by 71 memory space and needs a path after the first 1024 bytes have fallen
+    size, first = 71, 1024
+    cells = [(x, y) for y in range(size) for x in range(size) if (x, y) not in ((0, 0), (size - 1, size - 1))]
+    falling = min(falling, len(cells))
+    while True:
+        rng.shuffle(cells)
+        if corner_to_corner(set(cells[:min(first, falling)]), size):
+            return ''.join(f'{x},{y}\n' for x, y in cells[:falling])
+
+
+def day19(rng: random.Random, patterns: int, designs: int) -> str:
+    colours = 'wubrg'
+    # one colour is never a towel on its own and never next to a second colour in any towel, so a design with the
+    # first colour between two of the second can't be made, about a quarter of the designs have that put in
+    missing, apart = rng.sample(colours, 2)
+    towels: set[str] = set()
+    while len(towels) < patterns:
+        towel = ''.join(rng.choice(colours) for _ in range(rng.randint(1, 8)))
+        if towel != missing and missing + apart not in towel and apart + missing not in towel:
+            towels.add(towel)
+    towel_list = sorted(towels)
+    rv = ', '.join(towel_list) + '\n\n'
+    for _ in range(designs):
+        pieces: list[str] = []
+        length = rng.randint(20, 60)
+        while sum(map(len, pieces)) < length:
+            pieces.append(rng.choice(towel_list))
+        if rng.random() < 0.25:
+            pieces.insert(rng.randint(0, len(pieces)), apart + missing + apart)
+        rv += ''.join(pieces) + '\n'
+    return rv
+
+
+@dataclass
+class InputGenerator:
+    function: Callable[..., str]
+    parameters: dict[str, int]
+    scale: str
+
+
+# the defaults are roughly the size of the real puzzle inputs, scale names the parameter --size sets
+GENERATORS: dict[int, InputGenerator] = {
+    1: InputGenerator(day01, {'lines': 1000}, 'lines'),
+    2: InputGenerator(day02, {'reports': 1000, 'length': 8}, 'reports'),
+    3: InputGenerator(day03, {'instructions': 750}, 'instructions'),
+    4: InputGenerator(day04, {'size': 140}, 'size'),
+    5: InputGenerator(day05, {'pages': 49, 'updates': 200}, 'updates'),
+    6: InputGenerator(day06, {'size': 130, 'density': 50}, 'size'),
+    7: InputGenerator(day07, {'equations': 850, 'numbers': 12}, 'equations'),
+    10: InputGenerator(day10, {'size': 50}, 'size'),
+    11: InputGenerator(day11, {'stones': 8}, 'stones'),
+    12: InputGenerator(day12, {'size': 140}, 'size'),
+    13: InputGenerator(day13, {'machines': 320}, 'machines'),
+    14: InputGenerator(day14, {'robots': 500}, 'robots'),
+    15: InputGenerator(day15, {'size': 50, 'moves': 20000}, 'size'),
+    16: InputGenerator(day16, {'size': 141, 'loops': 20}, 'size'),
+    17: InputGenerator(day17, {'length': 2}, 'length'),
+    18: InputGenerator(day18, {'falling': 3450}, 'falling'),
+    19: InputGenerator(day19, {'patterns': 447, 'designs': 400}, 'designs'),
+}
+
+
+def generate(day: int, seed: int=0, **parameters: int) -> str:
+    if day not in GENERATORS:
+        raise ValueError(f'no generator for day {day}')
+    generator = GENERATORS[day]
+    for name in parameters:
+        if name not in generator.parameters:
+            raise ValueError(f'unknown parameter {name} for day {day}')
+    return generator.function(random.Random(seed), **(generator.parameters | parameters))
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Advent of Code 2024 - seeded synthetic input generator')
+    parser.add_argument('day', type=int, help='the day to generate an input for')
+    parser.add_argument('--seed', type=int, default=0, help='random seed')
+    parser.add_argument('--size', type=int, help="sets the day's scale parameter")
+    parser.add_argument('--param', action='append', default=[], metavar='NAME=VALUE',
+                        help='set any other parameter of the generator, may be repeated')
+    parser.add_argument('--list', action='store_true', help="list the day's parameters and exit")
+    parser.add_argument('-o', '--output', help='file to write, defaults to standard output')
+    return parser.parse_args()
+
+
+def main() -> None:
+
+    arguments = parse_arguments()
+
+    if arguments.day not in GENERATORS:
+        print('invalid day', file=sys.stderr)
+        sys.exit(1)
+    generator = GENERATORS[arguments.day]
+
+    if arguments.list:
+        for name, value in generator.parameters.items():
+            print(f'{name} = {value}' + (' (scale)' if name == generator.scale else ''))
+        return
+
+    parameters: dict[str, int] = {}
+    for item in arguments.param:
+        name, _, value = item.partition('=')
+        parameters[name] = int(value)
+    if arguments.size is not None:
+        parameters[generator.scale] = arguments.size
+
+    try:
+        text = generate(arguments.day, arguments.seed, **parameters)
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    if arguments.output:
+        with open(arguments.output, 'w') as file:
+            file.write(text)
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
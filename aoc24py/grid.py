@@ -6,7 +6,15 @@
 # Website:  leechristie.com
 
 
-from typing import Optional
+from array import array
+from collections import deque
+from collections.abc import Iterator
+from itertools import accumulate
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from astar import Graph
+from inputs import lines
 
 
 class CharacterGrid:
@@ -26,12 +34,10 @@ class CharacterGrid:
 
     @staticmethod
     def read_character_grid(filename: str) -> 'CharacterGrid':
-        lines = []
-        with open(filename) as file:
-            for line in file:
-                line = line.strip()
-                lines.append(line)
-        return CharacterGrid(lines)
+        rows = []
+        for line in lines(filename):
+            rows.append(line.strip().decode())
+        return CharacterGrid(rows)
 
     def __str__(self) -> str:
         rv: str = ''
@@ -76,39 +82,37 @@ class MutableCharacterGrid:
 
     @staticmethod
     def read_character_grid(filename: str, locator: str='\0') -> tuple['MutableCharacterGrid', tuple[int, int]]:
-        lines = []
+        rows = []
         location = None
-        with open(filename) as file:
-            for y, line in enumerate(file):
-                line = list(line.strip())
-                for x, c in enumerate(line):
-                    if c == locator:
-                        location = (y, x)
-                lines.append(line)
-        return MutableCharacterGrid(lines), location
+        for y, line in enumerate(lines(filename)):
+            row = list(line.strip().decode())
+            for x, c in enumerate(row):
+                if c == locator:
+                    location = (y, x)
+            rows.append(row)
+        return MutableCharacterGrid(rows), location
 
     @staticmethod
     def read_character_grid_with_footer(filename: str, locator: str, translation: dict[str, str]=None) -> tuple['MutableCharacterGrid', tuple[int, int], str]:
-        lines = []
+        rows = []
         location = None
-        footer = ''
+        footer = []
         done_grid = False
-        with open(filename) as file:
-            for y, line in enumerate(file):
-                if not done_grid:
-                    line = list(line.strip())
-                    if translation is not None:
-                        line = MutableCharacterGrid.translate(line, translation)
-                    for x, c in enumerate(line):
-                        if c == locator:
-                            location = (y, x)
-                    if not line:
-                        done_grid = True
-                    else:
-                        lines.append(line)
+        for y, line in enumerate(lines(filename)):
+            if not done_grid:
+                row = list(line.strip().decode())
+                if translation is not None:
+                    row = MutableCharacterGrid.translate(row, translation)
+                for x, c in enumerate(row):
+                    if c == locator:
+                        location = (y, x)
+                if not row:
+                    done_grid = True
                 else:
-                    footer += line
-        return MutableCharacterGrid(lines), location, footer.strip()
+                    rows.append(row)
+            else:
+                footer.append(line.strip())
+        return MutableCharacterGrid(rows), location, b''.join(footer).decode()
 
     def __str__(self) -> str:
         rv: str = ''
@@ -181,6 +185,150 @@ class MutableCharacterGrid:
         return MutableCharacterGrid([[character] * width for _ in range(height)])
 
 
+# the rows of a grid as they are read, each with up to k - 1 rows above it, so a pattern at most k rows tall can be
+# found while only k rows are held in memory, the grid ends at the end of the file or at a blank line
+def row_windows(filename: str, k: int) -> Iterator[tuple[int, tuple[str, ...]]]:
+    assert k > 0
+    window: deque[str] = deque(maxlen=k)
+    for y, line in enumerate(lines(filename)):
+        line = line.strip()
+        if not line:
+            return
+        window.append(line.decode())
+        yield y, tuple(window)
+
+
+# the connected regions of same character cells, labels holds the region of cell (y, x) at y * width + x, and the
+# regions are numbered in the order their first cell appears reading the grid row by row
+@dataclass
+class Regions:
+    width: int
+    height: int
+    labels: array
+    characters: list[str]
+    areas: list[int]
+    bounds: list[tuple[int, int, int, int]]  # min y, min x, max y, max x
+
+    def __len__(self) -> int:
+        return len(self.areas)
+
+    def label(self, y: int, x: int) -> int:
+        return self.labels[y * self.width + x]
+
+    # the cells of every region, as flat indices in ascending order
+    def members(self) -> list[list[int]]:
+        rv: list[list[int]] = [[] for _ in self.areas]
+        for index, label in enumerate(self.labels):
+            rv[label].append(index)
+        return rv
+
+
+# labels the four way connected regions with an explicit stack, so region size is not limited by the recursion limit
+def label_regions(rows: list[str] | list[list[str]]) -> Regions:
+    height, width = len(rows), len(rows[0])
+    cells = ''.join(''.join(row) for row in rows)
+    size = height * width
+    labels = array('i', [-1]) * size
+    characters: list[str] = []
+    areas: list[int] = []
+    bounds: list[tuple[int, int, int, int]] = []
+    for start in range(size):
+        if labels[start] >= 0:
+            continue
+        label = len(areas)
+        character = cells[start]
+        labels[start] = label
+        stack = [start]
+        area = 0
+        min_y, min_x = divmod(start, width)
+        max_y, max_x = min_y, min_x
+        while stack:
+            index = stack.pop()
+            area += 1
+            y, x = divmod(index, width)
+            if x < min_x:
+                min_x = x
+            elif x > max_x:
+                max_x = x
+            if y > max_y:
+                max_y = y
+            for neighbour, inside in ((index - width, y > 0), (index + 1, x < width - 1),
+                                      (index + width, y < height - 1), (index - 1, x > 0)):
+                if inside and labels[neighbour] < 0 and cells[neighbour] == character:
+                    labels[neighbour] = label
+                    stack.append(neighbour)
+        characters.append(character)
+        areas.append(area)
+        bounds.append((min_y, min_x, max_y, max_x))
+    return Regions(width, height, labels, characters, areas, bounds)
+
+
+# cells held in one flat bytearray with a border of sentinel cells all the way round, so a cell is an int index and
+# moving is adding a constant offset, and a walk can't leave the grid without first standing on a sentinel
+class FlatGrid:
+
+    __slots__ = ['data', 'width', 'height', 'stride']
+
+    def __init__(self, height: int, width: int, fill: str, sentinel: str) -> None:
+        assert len(fill) == 1 and len(sentinel) == 1
+        self.width = width
+        self.height = height
+        self.stride = width + 2
+        self.data = bytearray(sentinel.encode() * (self.stride * (height + 2)))
+        for y in range(height):
+            start = self.index(y, 0)
+            self.data[start:start + width] = fill.encode() * width
+
+    @staticmethod
+    def from_rows(rows: list[str] | list[list[str]], sentinel: str) -> 'FlatGrid':
+        rv = FlatGrid(len(rows), len(rows[0]), sentinel, sentinel)
+        for y, row in enumerate(rows):
+            # a row of the wrong width would resize the data and shift every row after it
+            encoded = ''.join(row).encode()
+            if len(encoded) != rv.width:
+                raise ValueError(f'row {y} is {len(encoded)} wide, expected {rv.width}')
+            start = rv.index(y, 0)
+            rv.data[start:start + rv.width] = encoded
+        return rv
+
+    def index(self, y: int, x: int) -> int:
+        return (y + 1) * self.stride + x + 1
+
+    def location(self, index: int) -> tuple[int, int]:
+        y, x = divmod(index, self.stride)
+        return y - 1, x - 1
+
+    def offset(self, stride: tuple[int, int]) -> int:
+        return stride[0] * self.stride + stride[1]
+
+    def __getitem__(self, item: int) -> str:
+        return chr(self.data[item])
+
+    def __setitem__(self, key: int, value: str) -> None:
+        self.data[key] = ord(value)
+
+    def cells(self) -> Iterator[int]:
+        for y in range(self.height):
+            start = self.index(y, 0)
+            yield from range(start, start + self.width)
+
+    def find_first(self, target: str) -> Optional[int]:
+        for index in self.cells():
+            if self.data[index] == ord(target):
+                return index
+        return None
+
+    def find_all(self, target: str) -> list[int]:
+        return [index for index in self.cells() if self.data[index] == ord(target)]
+
+    def __str__(self) -> str:
+        rv: str = ''
+        for y in range(self.height):
+            start = self.index(y, 0)
+            rv += self.data[start:start + self.width].decode() + '\n'
+        return rv
+
+
 #                    y   x
 STRIDE_NORTH     = (-1,  0)
 STRIDE_NORTHEAST = (-1,  1)
@@ -195,6 +343,8 @@ STRIDE_NORTHWEST = (-1, -1)
 ALL_STRIDES = [STRIDE_NORTH, STRIDE_NORTHEAST, STRIDE_EAST, STRIDE_SOUTHEAST,
                STRIDE_SOUTH, STRIDE_SOUTHWEST, STRIDE_WEST, STRIDE_NORTHWEST]
 
+ORTHOGONAL_STRIDES = [STRIDE_NORTH, STRIDE_EAST, STRIDE_SOUTH, STRIDE_WEST]
+
 ROTATE_CLOCKWISE = {
     STRIDE_NORTH: STRIDE_EAST,
     STRIDE_EAST: STRIDE_SOUTH,
@@ -208,3 +358,279 @@ ROTATE_COUNTERCLOCKWISE = {
     STRIDE_WEST: STRIDE_SOUTH,
     STRIDE_NORTH: STRIDE_WEST
 }
+
+
+# a set of cells held as the bits of one int, bit y * (width + 1) + x for cell (y, x), so moving every cell of the
+# set one stride is a single shift, the spare bit at the end of each row is always clear and stops a shift east or
+# west wrapping onto the next row
+class BitGrid:
+
+    __slots__ = ['bits', 'width', 'height', 'stride', 'board']
+
+    def __init__(self, height: int, width: int, bits: int=0, board: Optional[int]=None) -> None:
+        self.width = width
+        self.height = height
+        self.stride = width + 1
+        if board is None:
+            row = (1 << width) - 1
+            board = 0
+            for y in range(height):
+                board |= row << (y * self.stride)
+        self.board = board
+        self.bits = bits & board
+
+    def like(self, bits: int) -> 'BitGrid':
+        return BitGrid(self.height, self.width, bits, self.board)
+
+    @staticmethod
+    def from_rows(rows: list[str] | list[list[str]], characters: str) -> 'BitGrid':
+        rv = BitGrid(len(rows), len(rows[0]))
+        for y, row in enumerate(rows):
+            for x, c in enumerate(row):
+                if c in characters:
+                    rv.add((y, x))
+        return rv
+
+    def bit(self, item: tuple[int, int]) -> int:
+        y, x = item
+        assert 0 <= y < self.height and 0 <= x < self.width
+        return 1 << (y * self.stride + x)
+
+    def __contains__(self, item: tuple[int, int]) -> bool:
+        y, x = item
+        return 0 <= y < self.height and 0 <= x < self.width and bool(self.bits >> (y * self.stride + x) & 1)
+
+    def add(self, item: tuple[int, int]) -> None:
+        self.bits |= self.bit(item)
+
+    def discard(self, item: tuple[int, int]) -> None:
+        self.bits &= ~self.bit(item)
+
+    def shifted(self, stride: tuple[int, int]) -> 'BitGrid':
+        offset = stride[0] * self.stride + stride[1]
+        return self.like(self.bits << offset if offset >= 0 else self.bits >> -offset)
+
+    # every cell next to a cell of the set in one of the strides
+    def neighbours(self, strides: list[tuple[int, int]]=ORTHOGONAL_STRIDES) -> 'BitGrid':
+        rv = 0
+        for stride in strides:
+            offset = stride[0] * self.stride + stride[1]
+            rv |= self.bits << offset if offset >= 0 else self.bits >> -offset
+        return self.like(rv)
+
+    # the cells of this set that can be reached from the seed by moving between cells of this set, and the number of
+    # steps taken to reach the last of them, or to reach the target if it is given and reached first
+    def flood(self, seed: 'BitGrid', target: Optional[tuple[int, int]]=None,
+              strides: list[tuple[int, int]]=ORTHOGONAL_STRIDES) -> tuple['BitGrid', int]:
+        reached = seed.bits & self.bits
+        target_bit = self.bit(target) if target is not None else 0
+        steps = 0
+        while not reached & target_bit:
+            grown = reached
+            for stride in strides:
+                offset = stride[0] * self.stride + stride[1]
+                grown |= reached << offset if offset >= 0 else reached >> -offset
+            grown &= self.bits
+            if grown == reached:
+                break
+            reached = grown
+            steps += 1
+        return self.like(reached), steps
+
+    def __and__(self, other: 'BitGrid') -> 'BitGrid':
+        return self.like(self.bits & other.bits)
+
+    def __or__(self, other: 'BitGrid') -> 'BitGrid':
+        return self.like(self.bits | other.bits)
+
+    def __sub__(self, other: 'BitGrid') -> 'BitGrid':
+        return self.like(self.bits & ~other.bits)
+
+    def __invert__(self) -> 'BitGrid':
+        return self.like(~self.bits)
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, BitGrid) and self.board == other.board and self.bits == other.bits
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def cells(self) -> Iterator[tuple[int, int]]:
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            yield divmod(low.bit_length() - 1, self.stride)
+            bits ^= low
+
+
+# the result of a breadth first search over a flat grid, cells not reached have distance -1, the parent of a cell is
+# the cell it was first reached from, reached is every reached cell in the order it was reached (so by distance), and
+# paths (if counted) is the number of shortest paths to each cell from any source
+@dataclass
+class DistanceField:
+    grid: FlatGrid
+    distances: array
+    parents: array
+    reached: list[int]
+    paths: Optional[list[int]]
+
+    def distance(self, index: int) -> Optional[int]:
+        distance = self.distances[index]
+        return distance if distance >= 0 else None
+
+    # one shortest path from a source to the target, as flat indices, or None if the target wasn't reached
+    def path_to(self, target: int) -> Optional[list[int]]:
+        if self.distances[target] < 0:
+            return None
+        rv: list[int] = [target]
+        while self.parents[rv[-1]] >= 0:
+            rv.append(self.parents[rv[-1]])
+        return rv[::-1]
+
+
+# unit cost breadth first search from every source at once, a cell can be entered if its character is in passable,
+# or if passable is a function and passable(from_index, to_index) is true, the sentinel border must not be passable,
+# stops at the end of the layer that reaches the goal
+def distance_field(grid: FlatGrid, sources: list[int], passable: str | Callable[[int, int], bool],
+                   goal: Optional[int]=None, strides: list[tuple[int, int]]=ORTHOGONAL_STRIDES,
+                   count_paths: bool=False) -> DistanceField:
+    data = grid.data
+    offsets = [grid.offset(stride) for stride in strides]
+    distances = array('i', [-1]) * len(data)
+    parents = array('i', [-1]) * len(data)
+    paths: Optional[list[int]] = [0] * len(data) if count_paths else None
+    allowed = bytearray(256)
+    if isinstance(passable, str):
+        for character in passable:
+            allowed[ord(character)] = 1
+    reached: list[int] = []
+    for source in sources:
+        distances[source] = 0
+        reached.append(source)
+        if paths is not None:
+            paths[source] = 1
+    frontier = reached[:]
+    distance = 0
+    while frontier and (goal is None or distances[goal] < 0):
+        distance += 1
+        layer: list[int] = []
+        for index in frontier:
+            for offset in offsets:
+                neighbour = index + offset
+                if allowed[data[neighbour]] if not callable(passable) else passable(index, neighbour):
+                    if distances[neighbour] < 0:
+                        distances[neighbour] = distance
+                        parents[neighbour] = index
+                        layer.append(neighbour)
+                        if paths is not None:
+                            paths[neighbour] = paths[index]
+                    elif paths is not None and distances[neighbour] == distance:
+                        paths[neighbour] += paths[index]
+        reached += layer
+        frontier = layer
+    return DistanceField(grid, distances, parents, reached, paths)
+
+
+# for every cell of a flat grid and every direction, the index of the first blocked cell along that direction, the
+# sentinel border always blocks, so a ray that ends on the border leaves the grid, obstacles can be added and removed
+# and only the rays that they cut are updated
+class RayIndex:
+
+    __slots__ = ['grid', 'offsets', 'blocked', 'rays']
+
+    def __init__(self, grid: FlatGrid, obstacles: str, strides: list[tuple[int, int]]=ORTHOGONAL_STRIDES) -> None:
+        self.grid = grid
+        self.offsets = [grid.offset(stride) for stride in strides]
+        self.blocked = bytearray(b'\x01' * len(grid.data))
+        characters = obstacles.encode()
+        for index in grid.cells():
+            self.blocked[index] = grid.data[index] in characters
+        self.rays = [self.cast(offset) for offset in self.offsets]
+
+    # every ray in one direction, each cell takes its answer from the next cell along, so that one is filled first
+    def cast(self, offset: int) -> array:
+        blocked = self.blocked
+        size = len(blocked)
+        rv = array('i', [-1]) * size
+        for index in (range(size - 1, -1, -1) if offset > 0 else range(size)):
+            ahead = index + offset
+            if 0 <= ahead < size:
+                rv[index] = ahead if blocked[ahead] else rv[ahead]
+        return rv
+
+    # the first blocked cell from index (not counting index itself) along direction, an index into the strides
+    def next_obstacle(self, index: int, direction: int) -> int:
+        return self.rays[direction][index]
+
+    def on_border(self, index: int) -> bool:
+        y, x = self.grid.location(index)
+        return not (0 <= y < self.grid.height and 0 <= x < self.grid.width)
+
+    def __contains__(self, index: int) -> bool:
+        return bool(self.blocked[index])
+
+    def add(self, index: int) -> None:
+        assert not self.on_border(index)
+        if not self.blocked[index]:
+            self.blocked[index] = 1
+            for direction, offset in enumerate(self.offsets):
+                self.update(direction, offset, index, index)
+
+    def remove(self, index: int) -> None:
+        assert not self.on_border(index)
+        if self.blocked[index]:
+            self.blocked[index] = 0
+            for direction, offset in enumerate(self.offsets):
+                self.update(direction, offset, index, self.rays[direction][index])
+
+    # the cells looking along a direction at index, back to and including the blocked cell before them, now see target
+    def update(self, direction: int, offset: int, index: int, target: int) -> None:
+        ray = self.rays[direction]
+        behind = index - offset
+        while 0 <= behind < len(ray):
+            ray[behind] = target
+            if self.blocked[behind]:
+                break
+            behind -= offset
+
+
+# the grid compiled once into a graph that astar can search, only cells whose character is passable are nodes with
+# edges, and a node is the cell's flat index, with a turn cost the node is index * len(strides) + direction instead,
+# a move goes one cell forward keeping the direction, and a turn changes to the next or previous direction in place
+def compile_graph(grid: FlatGrid, passable: str, move_cost: int=1, turn_cost: Optional[int]=None,
+                  strides: list[tuple[int, int]]=ORTHOGONAL_STRIDES) -> Graph:
+    data = grid.data
+    offsets = [grid.offset(stride) for stride in strides]
+    allowed = bytearray(256)
+    for character in passable:
+        allowed[ord(character)] = 1
+    directions = len(strides)
+    size = len(data) if turn_cost is None else len(data) * directions
+    # the edges are appended in node order, counted per node, and the counts summed into the row starts at the end
+    counts = array('i', [0]) * (size + 1)
+    targets: list[int] = []
+    weights: list[int] = []
+    for index in grid.cells():
+        if not allowed[data[index]]:
+            continue
+        if turn_cost is None:
+            for offset in offsets:
+                if allowed[data[index + offset]]:
+                    targets.append(index + offset)
+                    weights.append(move_cost)
+                    counts[index + 1] += 1
+            continue
+        for direction, offset in enumerate(offsets):
+            node = index * directions + direction
+            if allowed[data[index + offset]]:
+                targets.append(node + offset * directions)
+                weights.append(move_cost)
+                counts[node + 1] += 1
+            for turn in (1, -1):
+                targets.append(index * directions + (direction + turn) % directions)
+                weights.append(turn_cost)
+            counts[node + 1] += 2
+    return Graph(array('i', accumulate(counts)), array('i', targets), array('q', weights))
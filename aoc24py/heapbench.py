@@ -0,0 +1,161 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import argparse
+import heapq
+import math
+import random
+import sys
+import time
+from typing import Callable
+
+from astar import BinaryMinHeap, BucketQueue, Graph, IndexedHeap
+
+
+# a width by width grid with a random weight on each edge, so dijkstra lowers keys often, like the day 16 maze does
+def random_grid_graph(rng: random.Random, width: int) -> Graph:
+    edges: list[tuple[int, int, int]] = []
+    for y in range(width):
+        for x in range(width):
+            node = y * width + x
+            for dy, dx in ((-1, 0), (0, 1), (1, 0), (0, -1)):
+                if 0 <= y + dy < width and 0 <= x + dx < width:
+                    edges.append((node, (y + dy) * width + x + dx, rng.randint(1, 9)))
+    return Graph.from_edges(width * width, edges)
+
+
+def dijkstra(graph: Graph, queue: BinaryMinHeap[int] | IndexedHeap | BucketQueue) -> list[float]:
+    starts, targets, weights = graph.starts, graph.targets, graph.weights
+    rv: list[float] = [math.inf] * len(graph)
+    rv[0] = 0
+    queue.insert(0, 0)
+    while not queue.empty():
+        node = queue.pop_min()
+        distance = rv[node]
+        for edge in range(starts[node], starts[node + 1]):
+            target = targets[edge]
+            tentative = distance + weights[edge]
+            if tentative < rv[target]:
+                rv[target] = tentative
+                queue.decrease_key(target, tentative)
+    return rv
+
+
+# heapq can't lower a key, so a lowered node is pushed again and the stale entries are skipped when they come out
+def dijkstra_lazy(graph: Graph) -> list[float]:
+    starts, targets, weights = graph.starts, graph.targets, graph.weights
+    rv: list[float] = [math.inf] * len(graph)
+    rv[0] = 0
+    queue: list[tuple[float, int]] = [(0, 0)]
+    while queue:
+        distance, node = heapq.heappop(queue)
+        if distance > rv[node]:
+            continue
+        for edge in range(starts[node], starts[node + 1]):
+            target = targets[edge]
+            tentative = distance + weights[edge]
+            if tentative < rv[target]:
+                rv[target] = tentative
+                heapq.heappush(queue, (tentative, target))
+    return rv
+
+
+def heap_sort(keys: list[float], arity: int) -> list[float]:
+    queue = IndexedHeap.heapify(list(enumerate(keys)), arity)
+    rv: list[float] = []
+    while not queue.empty():
+        rv.append(keys[queue.pop_min()])
+    return rv
+
+
+def heap_sort_binary(keys: list[float]) -> list[float]:
+    queue: BinaryMinHeap[int] = BinaryMinHeap()
+    for node, key in enumerate(keys):
+        queue.insert(node, key)
+    rv: list[float] = []
+    while not queue.empty():
+        rv.append(keys[queue.pop_min()])
+    return rv
+
+
+def heap_sort_lazy(keys: list[float]) -> list[float]:
+    queue = [(key, node) for node, key in enumerate(keys)]
+    heapq.heapify(queue)
+    rv: list[float] = []
+    while queue:
+        rv.append(heapq.heappop(queue)[0])
+    return rv
+
+
+def best_of[T](runs: int, function: Callable[[], T]) -> tuple[int, T]:
+    best_ns = 0
+    result = None
+    for run in range(runs):
+        start = time.perf_counter_ns()
+        result = function()
+        elapsed = time.perf_counter_ns() - start
+        best_ns = elapsed if run == 0 else min(best_ns, elapsed)
+    return best_ns, result
+
+
+def report(title: str, runs: int, contenders: dict[str, Callable[[], list[float]]]) -> None:
+    print(title)
+    times: dict[str, int] = {}
+    expected = None
+    for name, function in contenders.items():
+        times[name], result = best_of(runs, function)
+        if expected is None:
+            expected = result
+        assert result == expected, f'{name} gave a different result'
+    fastest = min(times.values())
+    for name, elapsed_ns in times.items():
+        print(f'    {name + ":":<20} {elapsed_ns / 1000:>10,.0f} μs  {elapsed_ns / fastest:5.2f}x')
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Advent of Code 2024 - priority queue microbenchmark')
+    parser.add_argument('--size', type=int, default=150, help='width of the random grid graph for dijkstra')
+    parser.add_argument('--keys', type=int, default=50000, help='number of random keys for heap sort')
+    parser.add_argument('--runs', type=int, default=5, help='number of runs, the best is reported')
+    parser.add_argument('--seed', type=int, default=0, help='random seed for the graph and keys')
+    return parser.parse_args()
+
+
+def main() -> None:
+
+    arguments = parse_arguments()
+
+    if arguments.size < 1 or arguments.keys < 1 or arguments.runs < 1:
+        print('invalid size, keys or runs', file=sys.stderr)
+        sys.exit(1)
+
+    rng = random.Random(arguments.seed)
+    graph = random_grid_graph(rng, arguments.size)
+    keys = [rng.random() for _ in range(arguments.keys)]
+
+    report(f'dijkstra on a {arguments.size}x{arguments.size} grid ({len(graph)} nodes, {graph.edge_count()} edges)',
+           arguments.runs, {
+               'BinaryMinHeap': lambda: dijkstra(graph, BinaryMinHeap()),
+               'IndexedHeap d=2': lambda: dijkstra(graph, IndexedHeap(len(graph), 2)),
+               'IndexedHeap d=4': lambda: dijkstra(graph, IndexedHeap(len(graph), 4)),
+               'IndexedHeap d=8': lambda: dijkstra(graph, IndexedHeap(len(graph), 8)),
+               'BucketQueue': lambda: dijkstra(graph, BucketQueue(len(graph))),
+               'heapq lazy': lambda: dijkstra_lazy(graph),
+           })
+
+    report(f'heap sort of {arguments.keys} keys', arguments.runs, {
+        'BinaryMinHeap': lambda: heap_sort_binary(keys),
+        'IndexedHeap d=2': lambda: heap_sort(keys, 2),
+        'IndexedHeap d=4': lambda: heap_sort(keys, 4),
+        'IndexedHeap d=8': lambda: heap_sort(keys, 8),
+        'heapq': lambda: heap_sort_lazy(keys),
+    })
+
+
+if __name__ == "__main__":
+    main()
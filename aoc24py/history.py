@@ -0,0 +1,254 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import argparse
+import html
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Any, Optional
+
+
+DEFAULT_HISTORY = '../benchmark_history.jsonl'
+
+
+# the commit of the repository this file is in, wherever the days are being run from
+def current_commit() -> tuple[str, bool]:
+    directory = os.path.dirname(os.path.abspath(__file__))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, check=True, cwd=directory).stdout.strip()
+        dirty = subprocess.run(['git', 'diff', '--quiet', 'HEAD'], capture_output=True, cwd=directory).returncode != 0
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown', False
+    return commit, dirty
+
+
+def append_records(filename: str, results: list[dict[str, Any]]) -> None:
+    commit, dirty = current_commit()
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%S%z')
+    with open(filename, 'a') as file:
+        for result in results:
+            record = dict(result)
+            record['commit'] = commit
+            record['dirty'] = dirty
+            record['timestamp'] = timestamp
+            file.write(json.dumps(record) + '\n')
+
+
+def load_history(filename: str) -> list[dict[str, Any]]:
+    rv: list[dict[str, Any]] = []
+    if not os.path.exists(filename):
+        return rv
+    with open(filename) as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                rv.append(json.loads(line))
+    return rv
+
+
+# regularised incomplete beta function, evaluated with Lentz's continued fraction
+def incomplete_beta(a: float, b: float, x: float) -> float:
+    if x <= 0:
+        return 0.0
+    if x >= 1:
+        return 1.0
+    if x > (a + 1) / (a + b + 2):
+        return 1.0 - incomplete_beta(b, a, 1.0 - x)
+    log_front = math.lgamma(a + b) - math.lgamma(a) - math.lgamma(b) + a * math.log(x) + b * math.log(1 - x)
+    tiny = 1e-300
+    c = 1.0
+    d = 1.0 - (a + b) * x / (a + 1)
+    d = 1.0 / (d if abs(d) > tiny else tiny)
+    f = d
+    for m in range(1, 300):
+        for numerator in (m * (b - m) * x / ((a + 2 * m - 1) * (a + 2 * m)),
+                          -(a + m) * (a + b + m) * x / ((a + 2 * m) * (a + 2 * m + 1))):
+            d = 1.0 + numerator * d
+            d = 1.0 / (d if abs(d) > tiny else tiny)
+            c = 1.0 + numerator / c
+            c = c if abs(c) > tiny else tiny
+            f *= c * d
+        if abs(c * d - 1.0) < 1e-12:
+            break
+    return math.exp(log_front) * f / a
+
+
+# probability that a Student's t variable with df degrees of freedom exceeds t
+def student_t_sf(t: float, df: float) -> float:
+    tail = 0.5 * incomplete_beta(df / 2, 0.5, df / (df + t * t))
+    return tail if t >= 0 else 1.0 - tail
+
+
+# one-sided Welch's t-test that the candidate samples have a greater mean than the baseline samples
+def welch_test(baseline: list[float], candidate: list[float]) -> tuple[float, float]:
+    assert len(baseline) >= 2 and len(candidate) >= 2, 'need at least two samples on each side'
+    n1, n2 = len(baseline), len(candidate)
+    v1, v2 = statistics.variance(baseline) / n1, statistics.variance(candidate) / n2
+    difference = statistics.mean(candidate) - statistics.mean(baseline)
+    if v1 + v2 == 0:
+        return (math.inf if difference > 0 else -math.inf if difference < 0 else 0.0), (0.0 if difference > 0 else 1.0)
+    t = difference / math.sqrt(v1 + v2)
+    df = (v1 + v2) ** 2 / (v1 ** 2 / (n1 - 1) + v2 ** 2 / (n2 - 1))
+    return t, student_t_sf(t, df)
+
+
+@dataclass
+class Comparison:
+    day: int
+    python: str
+    baseline_mean_ns: float
+    candidate_mean_ns: float
+    change: float
+    p_value: float
+    verdict: str
+
+
+# the commit a record was run on, with a + if it was run with uncommitted changes, so an edit can be compared with HEAD
+def record_commit(record: dict[str, Any]) -> str:
+    return record['commit'] + ('+' if record.get('dirty') else '')
+
+
+def samples_by_key(records: list[dict[str, Any]], commit: str) -> dict[tuple[int, str], list[int]]:
+    rv: dict[tuple[int, str], list[int]] = defaultdict(list)
+    for record in records:
+        if record_commit(record) == commit:
+            rv[(record['day'], record['python'])].extend(record['samples_ns'])
+    return rv
+
+
+def compare(records: list[dict[str, Any]], baseline: str, candidate: str,
+            alpha: float, threshold: float) -> list[Comparison]:
+    baseline_samples = samples_by_key(records, baseline)
+    candidate_samples = samples_by_key(records, candidate)
+    rv: list[Comparison] = []
+    for key in sorted(baseline_samples.keys() & candidate_samples.keys()):
+        before, after = baseline_samples[key], candidate_samples[key]
+        if len(before) < 2 or len(after) < 2:
+            continue
+        before_mean, after_mean = statistics.mean(before), statistics.mean(after)
+        change = after_mean / before_mean - 1
+        _, slower_p = welch_test(before, after)
+        _, faster_p = welch_test(after, before)
+        if slower_p < alpha and change > threshold:
+            verdict, p_value = 'SLOWER', slower_p
+        elif faster_p < alpha and -change > threshold:
+            verdict, p_value = 'faster', faster_p
+        else:
+            verdict, p_value = 'same', min(slower_p, faster_p)
+        rv.append(Comparison(key[0], key[1], before_mean, after_mean, change, p_value, verdict))
+    return rv
+
+
+def latest_commit(records: list[dict[str, Any]]) -> Optional[str]:
+    return record_commit(records[-1]) if records else None
+
+
+def print_comparisons(comparisons: list[Comparison], baseline: str, candidate: str) -> None:
+    print(f'Baseline:  {baseline}')
+    print(f'Candidate: {candidate}')
+    print()
+    for c in comparisons:
+        print(f'Day {c.day:2} [{c.python}]: {c.baseline_mean_ns / 1000:>12,.0f} μs -> {c.candidate_mean_ns / 1000:>12,.0f} μs'
+              f' ({c.change:+.1%}, p = {c.p_value:.4f}) {c.verdict}')
+
+
+def svg_chart(series: dict[str, list[tuple[str, float, float]]], width: int=640, height: int=200) -> str:
+    colours = ['#1f77b4', '#d62728', '#2ca02c', '#9467bd', '#ff7f0e', '#8c564b']
+    longest = max(len(points) for points in series.values())
+    top = max(mean + stdev for points in series.values() for _, mean, stdev in points) * 1.1 or 1.0
+    margin = 40
+
+    def px(i: int) -> float:
+        return margin + (width - 2 * margin) * (i / (longest - 1) if longest > 1 else 0.5)
+
+    def py(value: float) -> float:
+        return height - margin / 2 - (height - margin) * value / top
+
+    rv = f'<svg width="{width}" height="{height}" xmlns="http://www.w3.org/2000/svg">'
+    rv += f'<line x1="{margin}" y1="{py(0)}" x2="{width - margin}" y2="{py(0)}" stroke="#999"/>'
+    rv += f'<text x="2" y="{py(top / 1.1) + 4}" font-size="10">{top / 1.1 / 1000:,.0f} μs</text>'
+    for index, (python, points) in enumerate(sorted(series.items())):
+        colour = colours[index % len(colours)]
+        line = ' '.join(f'{px(i):.1f},{py(mean):.1f}' for i, (_, mean, _) in enumerate(points))
+        rv += f'<polyline fill="none" stroke="{colour}" points="{line}"/>'
+        for i, (commit, mean, stdev) in enumerate(points):
+            rv += f'<line x1="{px(i):.1f}" y1="{py(mean - stdev):.1f}" x2="{px(i):.1f}" y2="{py(mean + stdev):.1f}" stroke="{colour}" opacity="0.4"/>'
+            rv += f'<circle cx="{px(i):.1f}" cy="{py(mean):.1f}" r="3" fill="{colour}">'
+            rv += f'<title>{html.escape(python)} {html.escape(commit)}: {mean / 1000:,.0f} ± {stdev / 1000:,.0f} μs</title></circle>'
+        rv += f'<text x="{width - margin + 4}" y="{12 + 12 * index}" font-size="10" fill="{colour}">{html.escape(python)}</text>'
+    rv += '</svg>'
+    return rv
+
+
+def write_html_report(records: list[dict[str, Any]], filename: str) -> None:
+    by_day: dict[int, dict[str, list[tuple[str, float, float]]]] = defaultdict(lambda: defaultdict(list))
+    for record in records:
+        by_day[record['day']][record['python']].append((record_commit(record), record['mean_ns'], record['stdev_ns']))
+    with open(filename, 'w') as file:
+        file.write('<!DOCTYPE html>\n<html><head><meta charset="utf-8"><title>Advent of Code 2024 - Benchmark History</title></head>\n')
+        file.write('<body style="font-family: sans-serif">\n<h1>Advent of Code 2024 - Benchmark History</h1>\n')
+        for day in sorted(by_day):
+            file.write(f'<h2>Day {day}</h2>\n{svg_chart(by_day[day])}\n')
+        file.write('</body></html>\n')
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Advent of Code 2024 - benchmark history')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help='the history file')
+    commands = parser.add_subparsers(dest='command', required=True)
+    record = commands.add_parser('record', help='add the results written by bench.py --output to the history')
+    record.add_argument('results')
+    comparison = commands.add_parser('compare', help='flag significant changes against a baseline commit')
+    comparison.add_argument('baseline', help='the baseline commit, with a + for runs with uncommitted changes')
+    comparison.add_argument('candidate', nargs='?', help='the candidate commit, with a + for runs with uncommitted changes, defaults to the latest recorded')
+    comparison.add_argument('--alpha', type=float, default=0.01, help='significance level')
+    comparison.add_argument('--threshold', type=float, default=0.02,
+                            help='smallest relative change worth reporting')
+    report = commands.add_parser('report', help='write a static HTML report of the trends')
+    report.add_argument('output')
+    return parser.parse_args()
+
+
+def main() -> None:
+
+    arguments = parse_arguments()
+
+    if arguments.command == 'record':
+        with open(arguments.results) as file:
+            append_records(arguments.history, json.load(file))
+        return
+
+    records = load_history(arguments.history)
+    if not records:
+        print('no benchmark history', file=sys.stderr)
+        sys.exit(1)
+
+    if arguments.command == 'compare':
+        candidate = arguments.candidate if arguments.candidate is not None else latest_commit(records)
+        comparisons = compare(records, arguments.baseline, candidate, arguments.alpha, arguments.threshold)
+        if not comparisons:
+            print('no days benchmarked on both commits with the same interpreter', file=sys.stderr)
+            sys.exit(1)
+        print_comparisons(comparisons, arguments.baseline, candidate)
+        if any(c.verdict == 'SLOWER' for c in comparisons):
+            sys.exit(1)
+
+    elif arguments.command == 'report':
+        write_html_report(records, arguments.output)
+
+
+if __name__ == "__main__":
+    main()
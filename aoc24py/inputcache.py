@@ -0,0 +1,60 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import hashlib
+import os
+import pickle
+from typing import Any, Callable
+
+from inputs import STDIN, input_path
+
+
+# the cache is opt-in, set this environment variable (or pass --cache to main.py or bench.py) to turn it on
+CACHE_VARIABLE = 'AOC24_INPUT_CACHE'
+CACHE_DIRECTORY = '.aoc24_cache'
+
+
+def enabled() -> bool:
+    return os.environ.get(CACHE_VARIABLE, '') not in ('', '0')
+
+
+def enable() -> None:
+    os.environ[CACHE_VARIABLE] = '1'
+
+
+def file_digest(filename: str) -> str:
+    with open(filename, 'rb') as file:
+        return hashlib.file_digest(file, 'blake2b').hexdigest()[:32]
+
+
+def cache_path(filename: str, parser: Callable[..., Any], version: int, arguments: tuple[Any, ...]) -> str:
+    name = f'{parser.__module__}.{parser.__qualname__}'.replace('<', '').replace('>', '')
+    key = file_digest(input_path(filename))
+    if arguments:
+        key += '-' + hashlib.blake2b(repr(arguments).encode(), digest_size=8).hexdigest()
+    return os.path.join(CACHE_DIRECTORY, f'{name}-v{version}-{key}.pickle')
+
+
+# parses the file with the given parser, or loads the result of an earlier parse of the same file contents, bump the
+# version whenever the parser or the type it returns changes, input read from stdin is never cached
+def cached_parse[T](filename: str, parser: Callable[..., T], version: int, *arguments: Any) -> T:
+    if not enabled() or input_path(filename) == STDIN:
+        return parser(filename, *arguments)
+    path = cache_path(filename, parser, version, arguments)
+    try:
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+        pass
+    rv: T = parser(filename, *arguments)
+    os.makedirs(CACHE_DIRECTORY, exist_ok=True)
+    temporary = f'{path}.{os.getpid()}.tmp'
+    with open(temporary, 'wb') as file:
+        pickle.dump(rv, file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary, path)
+    return rv
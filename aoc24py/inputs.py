@@ -0,0 +1,150 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import mmap
+import os
+import re
+import sys
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# where the days read their inputs from, set this environment variable (or pass --input to main.py or bench.py) to a
+# directory holding the inputNN.txt files, to a single file to use for the day being run, or to - to read from stdin
+INPUT_VARIABLE = 'AOC24_INPUT'
+STDIN = '-'
+
+# everything but digits and minus signs becomes a space, so the integers can be split out in one pass
+NUMERIC = bytes(c if c in b'-0123456789' else ord(' ') for c in range(256))
+INTEGER = re.compile(rb'-?\d+')
+
+# stdin can only be read once, but a day may read its input more than once
+_stdin: Optional[bytes] = None
+
+
+def set_input(path: str) -> None:
+    os.environ[INPUT_VARIABLE] = path
+
+
+def input_path(filename: str) -> str:
+    override = os.environ.get(INPUT_VARIABLE, '')
+    if not override:
+        return filename
+    if override == STDIN or not os.path.isdir(override):
+        return override
+    return os.path.join(override, os.path.basename(filename))
+
+
+def read_stdin() -> bytes:
+    global _stdin
+    if _stdin is None:
+        _stdin = sys.stdin.buffer.read()
+    return _stdin
+
+
+# the whole input as a read only buffer, memory mapped so the file is never copied into the process, slicing it
+# copies only the slice
+@contextmanager
+def mapped(filename: str) -> Iterator[mmap.mmap | bytes]:
+    path = input_path(filename)
+    if path == STDIN:
+        yield read_stdin()
+        return
+    with open(path, 'rb') as file:
+        # an empty file can't be mapped
+        if os.fstat(file.fileno()).st_size == 0:
+            yield b''
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield buffer
+
+
+def buffer_lines(buffer: mmap.mmap | bytes) -> Iterator[bytes]:
+    start = 0
+    end = len(buffer)
+    while start < end:
+        stop = buffer.find(b'\n', start)
+        if stop < 0:
+            stop = end
+        line = buffer[start:stop]
+        yield line[:-1] if line.endswith(b'\r') else line
+        start = stop + 1
+
+
+# the lines of the input as bytes, without their line endings
+def lines(filename: str) -> Iterator[bytes]:
+    with mapped(filename) as buffer:
+        yield from buffer_lines(buffer)
+
+
+# the blank line separated sections of the input, each a list of lines
+def sections(filename: str) -> Iterator[list[bytes]]:
+    section: list[bytes] = []
+    for line in lines(filename):
+        if line.strip():
+            section.append(line)
+        elif section:
+            yield section
+            section = []
+    if section:
+        yield section
+
+
+# the mapped input is split in chunks of about this many bytes, so only one chunk is ever copied into the process
+CHUNK_SIZE = 1 << 20
+
+
+def split_integers(chunk: bytes) -> array:
+    try:
+        return array('q', map(int, chunk.translate(NUMERIC).split()))
+    except ValueError:
+        # a minus sign that isn't part of a number, the regex is slower but only takes the numbers
+        return array('q', map(int, INTEGER.findall(chunk)))
+
+
+# every signed integer in the buffer in order, as 64-bit ints
+def extract_integers(buffer: mmap.mmap | bytes) -> array:
+    if isinstance(buffer, bytes):
+        return split_integers(buffer)
+    rv = array('q')
+    start = 0
+    end = len(buffer)
+    while start < end:
+        # move the end of the chunk forward onto a separator, so no number is split across two chunks
+        stop = min(start + CHUNK_SIZE, end)
+        while stop < end and NUMERIC[buffer[stop]] != ord(' '):
+            stop += 1
+        rv.extend(split_integers(buffer[start:stop]))
+        start = stop
+    return rv
+
+
+def integers(filename: str) -> array:
+    with mapped(filename) as buffer:
+        return extract_integers(buffer)
+
+
+# the integers in rows of width values, for inputs with the same number of integers in each record
+def integer_rows(filename: str, width: int) -> Iterator[tuple[int, ...]]:
+    values = integers(filename)
+    assert len(values) % width == 0, f'{len(values)} integers do not make rows of {width}'
+    return zip(*[iter(values)] * width)
+
+
+# the integers as a numpy array, reshaped into rows of width values if given, without copying
+def integer_ndarray(filename: str, width: Optional[int]=None) -> 'np.ndarray':
+    assert np is not None, 'integer_ndarray needs numpy'
+    values = np.frombuffer(integers(filename), dtype=np.int64)
+    return values if width is None else values.reshape(-1, width)
@@ -6,72 +6,166 @@
 # Website:  leechristie.com
 
 
+import argparse
+import contextlib
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-from day01 import day01 as day01
-from day02 import day02 as day02
-from day03 import day03 as day03
-from day04 import day04 as day04
-from day05 import day05 as day05
-from day06 import day06 as day06
-from day07 import day07 as day07
-from day10 import day10 as day10
-from day11 import day11 as day11
-from day12 import day12 as day12
-from day13 import day13 as day13
-from day14 import day14 as day14
-from day15 import day15 as day15
-from day16 import day16 as day16
-from day17 import day17 as day17
-from day18 import day18 as day18
-from day19 import day19 as day19
+import inputcache
+import inputs
+from days import DAYS, load_day_timed, parse_days
+from memory import format_bytes, max_rss_bytes, traced
+from profiling import profile_day
+from runner import DayRun, run_day
+from timing import PhaseTimer
+
+
+def parse_arguments() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Advent of Code 2024')
+    parser.add_argument('day', help="the day to run, or 'all', or a list of days and ranges such as 1,3,7-12")
+    parser.add_argument('--import-time', action='store_true',
+                        help="report the time taken to import the day's module")
+    parser.add_argument('--phases', action='store_true',
+                        help='report the time taken by each phase of the day')
+    parser.add_argument('--cache', action='store_true',
+                        help='load parsed inputs from the input cache, parsing and caching them on a miss')
+    parser.add_argument('--input', metavar='PATH',
+                        help='read inputs from this directory, or read the day\'s input from this file, or from stdin if -')
+    parser.add_argument('--memory', action='store_true',
+                        help='trace memory, reporting the peak, max RSS and top allocation sites of each phase')
+    parser.add_argument('--profile', nargs='?', type=int, const=20, metavar='TOP',
+                        help='run the day under cProfile, writing a pstats file and a collapsed stack file, and print '
+                             'the top functions by cumulative time (default 20)')
+    parser.add_argument('--profile-dir', default='.', help='directory to write the profile files to')
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(),
+                        help='number of worker processes when running multiple days')
+    return parser.parse_args()
+
+
+def print_summary(runs: list[DayRun], wall: float, import_time: bool, memory: bool) -> None:
+    headers = ['Day', 'Part 1', 'Part 2', 'Time Taken', 'Wall', 'CPU']
+    if import_time:
+        headers.append('Import')
+    if memory:
+        headers.extend(['Peak', 'Max RSS'])
+    rows: list[list[str]] = []
+    for run in runs:
+        row = [str(run.day),
+               str(run.part1),
+               str(run.part2),
+               f'{run.time_taken:.6f} s' if run.time_taken is not None else '',
+               f'{run.wall:.6f} s',
+               f'{run.cpu:.6f} s']
+        if import_time:
+            row.append(f'{run.import_time:.6f} s')
+        if memory:
+            row.extend([format_bytes(run.peak_bytes), format_bytes(run.max_rss_bytes)])
+        rows.append(row)
+    widths = [max(len(row[i]) for row in rows + [headers]) for i in range(len(headers))]
+    for row in [headers, ['-' * width for width in widths]] + rows:
+        print('  '.join(cell.ljust(width) for cell, width in zip(row, widths)).rstrip())
+    print()
+    print(f"Wall Time:       {wall:.6f} s")
+    print(f"Sum of Wall:     {sum(run.wall for run in runs):.6f} s")
+    print(f"Sum of CPU:      {sum(run.cpu for run in runs):.6f} s")
+
+
+def print_phases(runs: list[DayRun], memory: bool) -> None:
+    for run in runs:
+        timer = PhaseTimer()
+        timer.phases = run.phases
+        print()
+        print(f'Day {run.day}')
+        print(timer, end='')
+        if memory:
+            print(timer.allocations(), end='')
+
+
+def print_memory(timer: PhaseTimer) -> None:
+    print()
+    print(f"Peak Memory:     {format_bytes(timer.peak_bytes())}")
+    print(f"Max RSS:         {format_bytes(max_rss_bytes())}")
+    print()
+    print(timer, end='')
+    print()
+    print(timer.allocations(), end='')
+
+
+def run_days(days: list[int], jobs: int, import_time: bool, phases: bool, memory: bool) -> None:
+    start: float = time.perf_counter()
+    runs: list[DayRun] = []
+    failed = False
+    # a fresh worker per day when tracing memory, so that max RSS is not carried over from an earlier day
+    with ProcessPoolExecutor(max_workers=min(jobs, len(days)), max_tasks_per_child=1 if memory else None) as executor:
+        futures = {executor.submit(run_day, day, memory): day for day in days}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                run: DayRun = future.result()
+            except Exception as e:
+                print(f'Day {day} failed: {e!r}', file=sys.stderr)
+                failed = True
+                continue
+            print(f'Day {day} done in {run.wall:.6f} s', file=sys.stderr)
+            runs.append(run)
+    stop: float = time.perf_counter()
+    runs.sort(key=lambda r: r.day)
+    print("Advent of Code 2024")
+    print()
+    print_summary(runs, stop - start, import_time, memory)
+    if phases or memory:
+        print_phases(runs, memory)
+    if failed:
+        sys.exit(1)
 
 
 def main() -> None:
 
-    if len(sys.argv) < 2:
-        print('missing argument', file=sys.stderr)
+    arguments = parse_arguments()
+
+    try:
+        days = parse_days(arguments.day)
+    except ValueError:
+        print('invalid day', file=sys.stderr)
         sys.exit(1)
-    if len(sys.argv) > 2:
-        print('too many arguments', file=sys.stderr)
+    if not days:
+        print('no days selected', file=sys.stderr)
         sys.exit(1)
 
-    if sys.argv[1] == '1':
-        day01()
-    elif sys.argv[1] == '2':
-        day02()
-    elif sys.argv[1] == '3':
-        day03()
-    elif sys.argv[1] == '4':
-        day04()
-    elif sys.argv[1] == '5':
-        day05()
-    elif sys.argv[1] == '6':
-        day06()
-    elif sys.argv[1] == '7':
-        day07()
-    elif sys.argv[1] == '10':
-        day10()
-    elif sys.argv[1] == '11':
-        day11()
-    elif sys.argv[1] == '12':
-        day12()
-    elif sys.argv[1] == '13':
-        day13()
-    elif sys.argv[1] == '14':
-        day14()
-    elif sys.argv[1] == '15':
-        day15()
-    elif sys.argv[1] == '16':
-        day16()
-    elif sys.argv[1] == '17':
-        day17()
-    elif sys.argv[1] == '18':
-        day18()
-    elif sys.argv[1] == '19':
-        day19()
-    else:
-        print('invalid day', file=sys.stderr)
+    if arguments.cache:
+        inputcache.enable()
+
+    single_day = len(days) == 1 and arguments.day != 'all'
+    if arguments.profile is not None and not single_day:
+        print('can only profile a single day', file=sys.stderr)
+        sys.exit(1)
+
+    if arguments.input is not None:
+        if not single_day and not os.path.isdir(arguments.input):
+            print('can only read a single day from a file or stdin', file=sys.stderr)
+            sys.exit(1)
+        inputs.set_input(arguments.input)
+
+    # a single day runs in this process with its output printed as it goes
+    if single_day:
+        function, import_time = load_day_timed(days[0])
+        with traced() if arguments.memory else contextlib.nullcontext():
+            if arguments.profile is not None:
+                timer: PhaseTimer = profile_day(function, DAYS[days[0]], arguments.profile_dir, arguments.profile)
+            else:
+                timer: PhaseTimer = function()
+        if arguments.import_time:
+            print(f"Import Time: {import_time:.6f} s")
+        if arguments.memory:
+            print_memory(timer)
+        elif arguments.phases:
+            print()
+            print(timer, end='')
+        return
+
+    run_days(days, arguments.jobs, arguments.import_time, arguments.phases, arguments.memory)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,73 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import contextlib
+import fnmatch
+import os
+import re
+import sys
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+# allocations made by the tracing and timing machinery itself are left out of the top allocation sites
+IGNORED_FILES = (tracemalloc.__file__, contextlib.__file__, fnmatch.__file__, os.path.join(os.path.dirname(re.__file__), '*'),
+                 __file__, os.path.join(os.path.dirname(__file__), 'timing.py'))
+
+
+# the high-water mark of the process's own memory, on Linux ru_maxrss carries over the parent's from before a fork,
+# even into a spawned worker, but the VmHWM of a process starts again at exec
+def max_rss_bytes() -> Optional[int]:
+    try:
+        with open('/proc/self/status') as file:
+            for line in file:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux reports kilobytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+
+def top_allocations(count: int) -> list[tuple[str, int]]:
+    snapshot = tracemalloc.take_snapshot()
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, filename) for filename in IGNORED_FILES])
+    rv: list[tuple[str, int]] = []
+    for statistic in snapshot.statistics('lineno')[:count]:
+        frame = statistic.traceback[0]
+        rv.append((f'{os.path.basename(frame.filename)}:{frame.lineno}', statistic.size))
+    return rv
+
+
+def format_bytes(size: Optional[int]) -> str:
+    if size is None:
+        return 'n/a'
+    for unit in ('B', 'KiB', 'MiB'):
+        if abs(size) < 1024:
+            return f'{size:.0f} {unit}' if unit == 'B' else f'{size:.1f} {unit}'
+        size /= 1024
+    return f'{size:.1f} GiB'
+
+
+@contextmanager
+def traced(frames: int=1) -> Iterator[None]:
+    tracemalloc.start(frames)
+    try:
+        yield
+    finally:
+        tracemalloc.stop()
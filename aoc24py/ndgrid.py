@@ -0,0 +1,146 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+from typing import Optional
+
+from grid import ALL_STRIDES, ORTHOGONAL_STRIDES
+from inputs import mapped
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+def available() -> bool:
+    return np is not None
+
+
+# a character grid held as a height by width array of bytes, indexing cell by cell works as with the other grids,
+# but whole grid questions should use the masks and shifted views, which run in numpy rather than per cell in python
+class ArrayGrid:
+
+    __slots__ = ['array', 'width', 'height']
+
+    def __init__(self, array: 'np.ndarray') -> None:
+        assert array.ndim == 2 and array.dtype == np.uint8
+        self.array = array
+        self.height, self.width = array.shape
+
+    def __getitem__(self, item: tuple[int, int]) -> Optional[str]:
+        y, x = item
+        if 0 <= y < self.height and 0 <= x < self.width:
+            return chr(self.array[y, x])
+        return None
+
+    def __setitem__(self, key: tuple[int, int], value: str) -> None:
+        y, x = key
+        assert len(value) == 1
+        if not 0 <= y < self.height or not 0 <= x < self.width:
+            print(f'warning dropped write at ({y}, {x})')
+            return
+        self.array[y, x] = ord(value)
+
+    @staticmethod
+    def from_bytes(data: bytes) -> 'ArrayGrid':
+        assert np is not None, 'ArrayGrid needs numpy'
+        data = data.replace(b'\r', b'').rstrip(b'\n') + b'\n'
+        stride = data.index(b'\n') + 1
+        assert len(data) % stride == 0, 'grid rows are not all the same width'
+        array = np.frombuffer(data, dtype=np.uint8).reshape(-1, stride)[:, :-1].copy()
+        return ArrayGrid(array)
+
+    @staticmethod
+    def from_rows(rows: list[str] | list[list[str]]) -> 'ArrayGrid':
+        return ArrayGrid.from_bytes('\n'.join(''.join(row) for row in rows).encode())
+
+    @staticmethod
+    def read_array_grid(filename: str) -> 'ArrayGrid':
+        with mapped(filename) as buffer:
+            return ArrayGrid.from_bytes(buffer[:])
+
+    def __str__(self) -> str:
+        return b''.join(row.tobytes() + b'\n' for row in self.array).decode()
+
+    def characters_stride(self, origin: tuple[int, int], stride: tuple[int, int], length: int) -> str:
+        rv = ''
+        item = origin
+        for i in range(length):
+            if self[item]:
+                rv += self[item]
+            item = (item[0] + stride[0], item[1] + stride[1])
+        return rv
+
+    def find_first(self, target: str) -> Optional[tuple[int, int]]:
+        assert len(target) == 1
+        found = np.argwhere(self.array == ord(target))
+        if len(found) == 0:
+            return None
+        return int(found[0][0]), int(found[0][1])
+
+    def mask(self, *characters: str) -> 'np.ndarray':
+        return np.isin(self.array, np.frombuffer(''.join(characters).encode(), dtype=np.uint8))
+
+    # the cells whose neighbour at the offset is inside the grid, and those neighbours, as views into the array
+    def shifted(self, offset: tuple[int, int]) -> tuple['np.ndarray', 'np.ndarray']:
+        cells = region(self.array.shape, [offset])
+        return self.array[cells], self.array[moved(cells, offset)]
+
+    # for every cell, how many of its neighbours in the given directions are in the mask
+    def neighbour_counts(self, mask: 'np.ndarray', strides: list[tuple[int, int]]=ORTHOGONAL_STRIDES) -> 'np.ndarray':
+        rv = np.zeros(mask.shape, dtype=np.uint8)
+        for stride in strides:
+            cells = region(mask.shape, [stride])
+            rv[cells] += mask[moved(cells, stride)]
+        return rv
+
+    def locations(self, mask: 'np.ndarray') -> list[tuple[int, int]]:
+        return [(int(y), int(x)) for y, x in np.argwhere(mask)]
+
+    # the cells where the word starts when read along the stride
+    def word_mask(self, word: str, stride: tuple[int, int]) -> 'np.ndarray':
+        return self.offsets_mask([((stride[0] * distance, stride[1] * distance), character)
+                                  for distance, character in enumerate(word)])
+
+    def count_word(self, word: str, strides: list[tuple[int, int]]=ALL_STRIDES) -> int:
+        return sum(int(self.word_mask(word, stride).sum()) for stride in strides)
+
+    # the cells where the pattern matches with its top left corner on the cell, the wildcard matches anything
+    def pattern_mask(self, pattern: list[str], wildcard: str='.') -> 'np.ndarray':
+        return self.offsets_mask([((dy, dx), character)
+                                  for dy, row in enumerate(pattern)
+                                  for dx, character in enumerate(row) if character != wildcard])
+
+    # the cells where every offset from the cell holds its character, false where an offset falls outside the grid
+    def offsets_mask(self, matches: list[tuple[tuple[int, int], str]]) -> 'np.ndarray':
+        rv = np.zeros(self.array.shape, dtype=bool)
+        cells = region(self.array.shape, [offset for offset, _ in matches])
+        inside = rv[cells]
+        inside[...] = True
+        for offset, character in matches:
+            inside &= self.array[moved(cells, offset)] == ord(character)
+        return rv
+
+    def count_pattern(self, pattern: list[str], wildcard: str='.') -> int:
+        return int(self.pattern_mask(pattern, wildcard).sum())
+
+
+# the cells of a grid of the given shape for which every offset stays inside the grid, as a pair of slices
+def region(shape: tuple[int, int], offsets: list[tuple[int, int]]) -> tuple[slice, slice]:
+    height, width = shape
+    top = max([0] + [-dy for dy, _ in offsets])
+    bottom = max(top, height - max([0] + [dy for dy, _ in offsets]))
+    left = max([0] + [-dx for _, dx in offsets])
+    right = max(left, width - max([0] + [dx for _, dx in offsets]))
+    return slice(top, bottom), slice(left, right)
+
+
+# the same region moved by the offset, indexing with both gives equal shaped views of a cell and its neighbour
+def moved(cells: tuple[slice, slice], offset: tuple[int, int]) -> tuple[slice, slice]:
+    rows, columns = cells
+    return slice(rows.start + offset[0], rows.stop + offset[0]), slice(columns.start + offset[1], columns.stop + offset[1])
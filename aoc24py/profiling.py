@@ -0,0 +1,78 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import cProfile
+import os
+import pstats
+from collections import defaultdict
+from typing import Callable
+
+from timing import PhaseTimer
+
+
+type Function = tuple[str, int, str]
+
+
+def frame_name(function: Function) -> str:
+    filename, line, name = function
+    if filename == '~':
+        return name
+    return f'{name} ({os.path.basename(filename)}:{line})'
+
+
+# cProfile only keeps caller/callee pairs, so the stacks are rebuilt from the roots down by splitting each function's
+# time between its callers in proportion to the cumulative time spent on each edge
+def collapsed_stacks(stats: pstats.Stats) -> dict[str, int]:
+    callees: dict[Function, dict[Function, float]] = defaultdict(dict)
+    roots: list[Function] = []
+    for function, (_, _, _, _, callers) in stats.stats.items():
+        if not callers:
+            roots.append(function)
+        for caller, (_, _, _, edge_cumulative) in callers.items():
+            callees[caller][function] = edge_cumulative
+
+    rv: dict[str, float] = defaultdict(float)
+
+    def walk(function: Function, cumulative: float, stack: list[Function]) -> None:
+        _, _, total, function_cumulative, _ = stats.stats[function]
+        if function_cumulative <= 0 or cumulative <= 0:
+            return
+        fraction = min(1.0, cumulative / function_cumulative)
+        stack.append(function)
+        rv[';'.join(frame_name(f) for f in stack)] += total * fraction
+        for callee, edge_cumulative in callees[function].items():
+            if callee not in stack:
+                walk(callee, edge_cumulative * fraction, stack)
+        stack.pop()
+
+    for root in roots:
+        walk(root, stats.stats[root][3], [])
+
+    return {stack: round(seconds * 1_000_000) for stack, seconds in rv.items() if seconds > 0}
+
+
+def write_collapsed(stats: pstats.Stats, filename: str) -> None:
+    with open(filename, 'w') as file:
+        for stack, microseconds in sorted(collapsed_stacks(stats).items()):
+            if microseconds > 0:
+                file.write(f'{stack} {microseconds}\n')
+
+
+def profile_day(function: Callable[[], PhaseTimer], name: str, directory: str, top: int) -> PhaseTimer:
+    profiler = cProfile.Profile()
+    timer: PhaseTimer = profiler.runcall(function)
+    stats_filename = os.path.join(directory, f'{name}.pstats')
+    collapsed_filename = os.path.join(directory, f'{name}.collapsed.txt')
+    profiler.dump_stats(stats_filename)
+    stats = pstats.Stats(profiler)
+    write_collapsed(stats, collapsed_filename)
+    print()
+    print(f'Profile:         {stats_filename}')
+    print(f'Collapsed Stack: {collapsed_filename}')
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    return timer
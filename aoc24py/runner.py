@@ -0,0 +1,64 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import contextlib
+import io
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from days import load_day_timed
+from memory import max_rss_bytes, traced
+from timing import Phase, PhaseTimer
+
+
+@dataclass
+class DayRun:
+    day: int
+    part1: Optional[str]
+    part2: Optional[str]
+    time_taken: Optional[float]
+    import_time: float
+    wall: float
+    cpu: float
+    output: str
+    phases: list[Phase]
+    peak_bytes: Optional[int] = None
+    max_rss_bytes: Optional[int] = None
+
+
+def find_value(output: str, prefix: str) -> Optional[str]:
+    for line in output.splitlines():
+        if line.startswith(prefix):
+            return line.removeprefix(prefix).strip()
+    return None
+
+
+def run_day(day: int, memory: bool=False) -> DayRun:
+    wall_start: float = time.perf_counter()
+    cpu_start: float = time.process_time()
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        function, import_time = load_day_timed(day)
+        with traced() if memory else contextlib.nullcontext():
+            timer: PhaseTimer = function()
+    cpu_stop: float = time.process_time()
+    wall_stop: float = time.perf_counter()
+    output: str = buffer.getvalue()
+    time_taken: Optional[str] = find_value(output, 'Time Taken:')
+    return DayRun(day=day,
+                  part1=find_value(output, 'Part 1:'),
+                  part2=find_value(output, 'Part 2:'),
+                  time_taken=float(time_taken.removesuffix('s')) if time_taken is not None else None,
+                  import_time=import_time,
+                  wall=wall_stop - wall_start,
+                  cpu=cpu_stop - cpu_start,
+                  output=output,
+                  phases=timer.phases,
+                  peak_bytes=timer.peak_bytes(),
+                  max_rss_bytes=max_rss_bytes() if memory else None)
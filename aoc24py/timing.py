@@ -0,0 +1,92 @@
+# Advent of Code 2024
+# Dr Lee A. Christie
+#
+# GitHub:   @leechristie
+# Mastodon: @0x1ac@techhub.social
+# Website:  leechristie.com
+
+
+import time
+import tracemalloc
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+from memory import format_bytes, max_rss_bytes, top_allocations
+
+
+# number of allocation sites kept per phase when tracing memory
+TOP_ALLOCATIONS = 5
+
+
+@dataclass
+class Phase:
+    name: str
+    wall_ns: int
+    cpu_ns: int
+    peak_bytes: Optional[int] = None
+    max_rss_bytes: Optional[int] = None
+    top_allocations: list[tuple[str, int]] = field(default_factory=list)
+
+
+class PhaseTimer:
+
+    __slots__ = ['phases']
+
+    def __init__(self) -> None:
+        self.phases: list[Phase] = []
+
+    # when tracemalloc is tracing, each phase also records its traced memory peak, the process max RSS and the
+    # allocation sites still holding the most memory at the end of the phase
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        tracing: bool = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+        wall_start: int = time.perf_counter_ns()
+        cpu_start: int = time.process_time_ns()
+        try:
+            yield
+        finally:
+            cpu_stop: int = time.process_time_ns()
+            wall_stop: int = time.perf_counter_ns()
+            phase = Phase(name, wall_stop - wall_start, cpu_stop - cpu_start)
+            if tracing:
+                phase.peak_bytes = tracemalloc.get_traced_memory()[1]
+                phase.max_rss_bytes = max_rss_bytes()
+                phase.top_allocations = top_allocations(TOP_ALLOCATIONS)
+            self.phases.append(phase)
+
+    def wall_ns(self) -> int:
+        return sum(phase.wall_ns for phase in self.phases)
+
+    def cpu_ns(self) -> int:
+        return sum(phase.cpu_ns for phase in self.phases)
+
+    def total(self) -> float:
+        return self.wall_ns() / 1_000_000_000
+
+    def peak_bytes(self) -> Optional[int]:
+        peaks = [phase.peak_bytes for phase in self.phases if phase.peak_bytes is not None]
+        return max(peaks) if peaks else None
+
+    def __str__(self) -> str:
+        width = max((len(phase.name) for phase in self.phases), default=0) + 2
+        rv: str = ''
+        for phase in self.phases:
+            rv += f'{phase.name + ":":<{width}} {phase.wall_ns / 1_000_000_000:.6f} s'
+            rv += f' (cpu {phase.cpu_ns / 1_000_000_000:.6f} s)'
+            if phase.peak_bytes is not None:
+                rv += f' peak {format_bytes(phase.peak_bytes)}, max rss {format_bytes(phase.max_rss_bytes)}'
+            rv += '\n'
+        return rv
+
+    def allocations(self) -> str:
+        rv: str = ''
+        for phase in self.phases:
+            if phase.top_allocations:
+                rv += f'{phase.name}:\n'
+                for site, size in phase.top_allocations:
+                    rv += f'    {format_bytes(size):>12}  {site}\n'
+        return rv